@@ -20,6 +20,11 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 import config
+from utils import SEPARADOR, registrar_banner
+
+
+# Fragmentos (en minúsculas) de los errores de WebDriver que indican que el navegador no responde
+ERRORES_NAVEGADOR_NO_RESPONDE = ("cannot connect to chrome", "not reachable")
 
 
 def verificar_puerto_disponible(port: int) -> bool:
@@ -116,9 +121,7 @@ def abrir_navegador_con_puerto_depuracion(nombre_navegador: str) -> bool:
 
 def mostrar_instrucciones_conexion(nombre_navegador: str) -> None:
     """Muestra instrucciones para conectar manualmente al navegador."""
-    logging.error("=" * 70)
-    logging.error(f"ERROR: No se pudo abrir {nombre_navegador} automáticamente")
-    logging.error("=" * 70)
+    registrar_banner(f"ERROR: No se pudo abrir {nombre_navegador} automáticamente", nivel=logging.ERROR)
     logging.error("")
     logging.error("SOLUCIÓN MANUAL:")
     logging.error("")
@@ -135,7 +138,7 @@ def mostrar_instrucciones_conexion(nombre_navegador: str) -> None:
     logging.error("")
     logging.error("3. Luego ejecuta este script nuevamente")
     logging.error("")
-    logging.error("=" * 70)
+    logging.error(SEPARADOR)
 
 
 def conectar_a_navegador_existente(nombre_navegador: str) -> Optional[webdriver.Chrome]:
@@ -152,9 +155,7 @@ def conectar_a_navegador_existente(nombre_navegador: str) -> Optional[webdriver.
     
     # Verificar primero si el puerto está disponible
     if not verificar_puerto_disponible(config.DEBUG_PORT):
-        logging.info("=" * 70)
-        logging.info(f"El puerto {config.DEBUG_PORT} no está disponible")
-        logging.info("=" * 70)
+        registrar_banner(f"El puerto {config.DEBUG_PORT} no está disponible")
         logging.info("")
         logging.info(f"{nombre_navegador} no está abierto con el puerto de depuración habilitado.")
         logging.info("")
@@ -175,6 +176,8 @@ def conectar_a_navegador_existente(nombre_navegador: str) -> Optional[webdriver.
         
         service = Service(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        # Sin esperas implícitas: todas las esperas son explícitas (WebDriverWait)
+        driver.implicitly_wait(0)
         
         logging.info(f"✓ Conectado exitosamente a {nombre_navegador} existente (puerto {config.DEBUG_PORT})")
         logging.info(f"  Ventana actual: {driver.title}")
@@ -183,13 +186,11 @@ def conectar_a_navegador_existente(nombre_navegador: str) -> Optional[webdriver.
         return driver
     
     except WebDriverException as e:
-        error_str = str(e)
-        logging.error("=" * 70)
-        logging.error(f"ERROR: No se pudo conectar a {nombre_navegador} existente")
-        logging.error("=" * 70)
+        error_str = str(e).lower()
+        registrar_banner(f"ERROR: No se pudo conectar a {nombre_navegador} existente", nivel=logging.ERROR)
         logging.error("")
         
-        if "cannot connect to chrome" in error_str.lower() or "not reachable" in error_str.lower():
+        if any(fragmento in error_str for fragmento in ERRORES_NAVEGADOR_NO_RESPONDE):
             logging.error(f"El puerto {config.DEBUG_PORT} está abierto pero {nombre_navegador} no responde.")
             logging.error("")
             logging.error("POSIBLES CAUSAS:")
@@ -11,9 +11,45 @@ Este módulo se encarga de:
 import time
 import logging
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from browser_popups import cerrar_popups_youtube, intentar_omitir_anuncios
 
 
+JS_EN_PANTALLA_COMPLETA = """
+    return !!(document.fullscreenElement || 
+             document.webkitFullscreenElement || 
+             document.mozFullScreenElement || 
+             document.msFullscreenElement);
+"""
+
+JS_REPRODUCIR = """
+    window.scrollTo(0, 0);
+    
+    // Intentar reproducir el video directamente
+    var video = document.querySelector('video');
+    if (video) {
+        video.play().catch(function(e) {
+            console.log('Error al reproducir video:', e);
+        });
+    }
+    
+    // También intentar con el botón de play
+    var playButton = document.querySelector('.ytp-play-button');
+    if (playButton) {
+        var ariaLabel = (playButton.getAttribute('aria-label') || '').toLowerCase();
+        if (ariaLabel.includes('play') || ariaLabel.includes('reproducir')) {
+            playButton.click();
+        }
+    }
+    
+    return {
+        video: !!video,
+        reproduciendo: !!video && video.readyState >= 3 && !video.paused
+    };
+"""
+
+
 class BrowserControls:
     """
     Clase encargada de controlar la reproducción y visualización de videos.
@@ -30,6 +66,19 @@ class BrowserControls:
         """
         self.driver = driver
     
+    def _en_pantalla_completa(self, driver=None) -> bool:
+        """
+        Indica si el documento actual está en pantalla completa.
+        
+        Args:
+            driver: WebDriver a consultar (por defecto, el del controlador). Permite
+                usarlo como condición de WebDriverWait.
+        
+        Returns:
+            bool: True si hay un elemento en pantalla completa.
+        """
+        return bool((driver or self.driver).execute_script(JS_EN_PANTALLA_COMPLETA))
+    
     def reproducir_video(self) -> bool:
         """
         Reproduce el video actual en YouTube SIN cambiar el foco ni traer la ventana al frente.
@@ -47,40 +96,25 @@ class BrowserControls:
         try:
             logging.info("Iniciando reproducción del video...")
             
-            # Asegurar que estamos en la ventana correcta (sin cambiar foco)
-            self.driver.switch_to.window(self.driver.current_window_handle)
-            
-            # Hacer scroll al inicio suavemente
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.2)
-            
-            # Reproducir usando JavaScript directamente (no cambia foco)
+            # Scroll al inicio y reproducción en una sola llamada (no cambia foco)
+            estado = {}
             try:
-                self.driver.execute_script("""
-                    // Intentar reproducir el video directamente
-                    var video = document.querySelector('video');
-                    if (video) {
-                        video.play().catch(function(e) {
-                            console.log('Error al reproducir video:', e);
-                        });
-                    }
-                    
-                    // También intentar con el botón de play
-                    var playButton = document.querySelector('.ytp-play-button');
-                    if (playButton) {
-                        var ariaLabel = playButton.getAttribute('aria-label') || '';
-                        if (ariaLabel.toLowerCase().includes('play') || 
-                            ariaLabel.toLowerCase().includes('reproducir')) {
-                            playButton.click();
-                        }
-                    }
-                """)
+                estado = self.driver.execute_script(JS_REPRODUCIR) or {}
                 logging.info("✓ Comando de reproducción enviado")
+                if not estado.get('video'):
+                    logging.warning("No se encontró el elemento de video en la página")
             except Exception as e:
                 logging.warning(f"Error al enviar comando de reproducción: {e}")
             
-            # Esperar un momento breve para que el video comience
-            time.sleep(0.3)
+            # Esperar a que el video tenga datos y esté reproduciéndose
+            try:
+                if not estado.get('reproduciendo'):
+                    WebDriverWait(self.driver, 5).until(lambda d: d.execute_script(
+                        "var v = document.querySelector('video');"
+                        "return !!v && v.readyState >= 3 && !v.paused;"
+                    ))
+            except TimeoutException:
+                logging.warning("El video aún no se está reproduciendo. Continuando...")
             
             # Cerrar popups y anuncios (modo silencioso, sin interferir)
             cerrar_popups_youtube(self.driver, max_intentos=1, silencioso=True)
@@ -105,24 +139,17 @@ class BrowserControls:
             return False
         
         try:
-            # Maximizar la ventana primero
+            # Verificar si YA está en pantalla completa (maximizar la ventana la sacaría de ella)
             try:
-                self.driver.maximize_window()
+                if self._en_pantalla_completa():
+                    logging.info("✓ El video ya está en pantalla completa")
+                    return True
             except:
                 pass
             
-            # Verificar si YA está en pantalla completa
+            # Maximizar la ventana antes de activar pantalla completa
             try:
-                ya_en_fullscreen = self.driver.execute_script("""
-                    return !!(document.fullscreenElement || 
-                             document.webkitFullscreenElement || 
-                             document.mozFullScreenElement || 
-                             document.msFullscreenElement);
-                """)
-                
-                if ya_en_fullscreen:
-                    logging.info("✓ El video ya está en pantalla completa")
-                    return True
+                self.driver.maximize_window()
             except:
                 pass
             
@@ -132,15 +159,12 @@ class BrowserControls:
             try:
                 body = self.driver.find_element(By.TAG_NAME, "body")
                 body.send_keys("f")
-                time.sleep(0.1)
                 
                 # Verificar que realmente entró en pantalla completa
-                en_fullscreen = self.driver.execute_script("""
-                    return !!(document.fullscreenElement || 
-                             document.webkitFullscreenElement || 
-                             document.mozFullScreenElement || 
-                             document.msFullscreenElement);
-                """)
+                try:
+                    en_fullscreen = WebDriverWait(self.driver, 2).until(self._en_pantalla_completa)
+                except TimeoutException:
+                    en_fullscreen = False
                 
                 if en_fullscreen:
                     logging.info("✓ Pantalla completa activada correctamente con la tecla F")
@@ -164,14 +188,7 @@ class BrowserControls:
         
         try:
             # Verificar si está en pantalla completa
-            en_fullscreen = self.driver.execute_script("""
-                return !!(document.fullscreenElement || 
-                         document.webkitFullscreenElement || 
-                         document.mozFullScreenElement || 
-                         document.msFullscreenElement);
-            """)
-            
-            if en_fullscreen:
+            if self._en_pantalla_completa():
                 # Salir de pantalla completa
                 self.driver.execute_script("""
                     if (document.exitFullscreen) {
@@ -184,32 +201,38 @@ class BrowserControls:
                         document.msExitFullscreen();
                     }
                 """)
-                time.sleep(0.3)
+                WebDriverWait(self.driver, 2).until_not(self._en_pantalla_completa)
                 logging.debug("Salido de pantalla completa")
         except:
             pass  # Si falla, no es crítico
     
-    def monitorear_reproduccion(self, duracion_segundos: int, intervalo: int = 2) -> None:
+    def monitorear_reproduccion(self, duracion_segundos: int, intervalo: int = 5) -> None:
         """
         Monitorea la reproducción del video y cierra popups periódicamente.
         
+        Duerme directamente hasta la siguiente revisión de popups en lugar de
+        despertar cada pocos segundos. El tiempo se mide con un reloj monótono,
+        así que el tiempo dedicado a cerrar popups no alarga la espera.
+        
         Args:
             duracion_segundos: Duración total del video en segundos.
-            intervalo: Intervalo en segundos entre verificaciones.
+            intervalo: Intervalo en segundos entre revisiones de popups y anuncios.
         """
         if not self.driver:
             return
         
-        tiempo_transcurrido = 0
+        fin = time.monotonic() + duracion_segundos
         
-        while tiempo_transcurrido < duracion_segundos:
-            tiempo_restante = duracion_segundos - tiempo_transcurrido
-            tiempo_dormir = min(intervalo, tiempo_restante)
-            time.sleep(tiempo_dormir)
-            tiempo_transcurrido += tiempo_dormir
+        while True:
+            tiempo_restante = fin - time.monotonic()
+            if tiempo_restante <= 0:
+                break
+            
+            time.sleep(min(intervalo, tiempo_restante))
+            if time.monotonic() >= fin:
+                break
             
             # Intentar cerrar popups y omitir anuncios periódicamente
-            if tiempo_transcurrido % 5 == 0:  # Cada 5 segundos
-                cerrar_popups_youtube(self.driver, max_intentos=1)
-                intentar_omitir_anuncios(self.driver, max_intentos=2)
+            cerrar_popups_youtube(self.driver, max_intentos=1)
+            intentar_omitir_anuncios(self.driver, max_intentos=2)
 
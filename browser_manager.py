@@ -7,11 +7,12 @@ Este módulo se encarga de:
 - Delegar controles e información a módulos especializados
 """
 
-import time
 import logging
-from typing import Optional
+import traceback
+from typing import List, Optional
 from selenium import webdriver
 import config
+from utils import SEPARADOR, registrar_banner
 from browser_info import BrowserInfo
 from browser_controls import BrowserControls
 from browser_connection import conectar_a_navegador_existente
@@ -32,6 +33,10 @@ class BrowserManager:
         self.nombre_navegador = "Brave" if config.NAVEGADOR.lower() == "brave" else "Chrome"
         self.browser_info: Optional[BrowserInfo] = None
         self.browser_controls: Optional[BrowserControls] = None
+        # Pestaña que se reutiliza para todos los videos
+        self.pestaña_videos: Optional[str] = None
+        # Ventanas obtenidas por verificar_conexion() para la siguiente carga
+        self._ventanas_verificadas: Optional[List[str]] = None
     
     def inicializar_navegador(self) -> bool:
         """
@@ -41,9 +46,7 @@ class BrowserManager:
             bool: True si la conexión fue exitosa, False en caso contrario.
         """
         logging.info("")
-        logging.info("=" * 70)
-        logging.info(f"VERIFICACIÓN: Conectando a navegador {self.nombre_navegador}...")
-        logging.info("=" * 70)
+        registrar_banner(f"VERIFICACIÓN: Conectando a navegador {self.nombre_navegador}...")
         
         try:
             # Conectar a navegador existente
@@ -64,16 +67,17 @@ class BrowserManager:
                 logging.error(f"ERROR CRÍTICO: El navegador no responde: {e}")
                 return False
             
+            self.pestaña_videos = None
+            
             # Inicializar módulos especializados
             self.browser_info = BrowserInfo(self.driver)
             self.browser_controls = BrowserControls(self.driver)
             
-            logging.info("=" * 70)
+            logging.info(SEPARADOR)
             return True
         
         except Exception as e:
             logging.error(f"ERROR CRÍTICO al inicializar navegador: {e}")
-            import traceback
             logging.error(f"Traceback: {traceback.format_exc()}")
             return False
     
@@ -81,6 +85,9 @@ class BrowserManager:
         """
         Carga una URL en el navegador.
         
+        El primer video se abre en una nueva pestaña; los siguientes se cargan en
+        esa misma pestaña con driver.get() para no crear una pestaña por video.
+        
         Args:
             url: La URL a cargar.
         
@@ -92,22 +99,99 @@ class BrowserManager:
             return False
         
         try:
-            # Reintentar conexión si hay problemas
-            try:
-                self.driver.window_handles
-            except:
-                logging.error("Error al obtener ventanas. Reintentando conexión...")
-                if not self.inicializar_navegador():
+            # Usar las ventanas comprobadas durante el margen inicial, si las hay
+            ventanas, self._ventanas_verificadas = self._ventanas_verificadas, None
+            if ventanas is None:
+                ventanas = self._obtener_ventanas()
+                if ventanas is None:
                     return False
             
-            return cargar_url_en_navegador(self.driver, url)
+            reutilizar = self.pestaña_videos is not None and self.pestaña_videos in ventanas
+            if reutilizar:
+                # El foco puede estar en otra pestaña (p. ej. tras cerrar_pestaña_actual)
+                self.driver.switch_to.window(self.pestaña_videos)
+            if not cargar_url_en_navegador(self.driver, url, reutilizar_pestaña=reutilizar):
+                return False
+            
+            if not reutilizar:
+                self.pestaña_videos = self.driver.current_window_handle
+            return True
         
         except Exception as e:
             logging.error(f"ERROR al cargar URL: {e}")
-            import traceback
             logging.error(f"Traceback: {traceback.format_exc()}")
             return False
     
+    def verificar_conexion(self) -> bool:
+        """
+        Comprueba que el navegador responde y reconecta si es necesario.
+        
+        Pensado para ejecutarse mientras corre el margen inicial: las ventanas
+        obtenidas se guardan y la siguiente llamada a cargar_url() no vuelve a
+        consultarlas.
+        
+        Returns:
+            bool: True si el navegador está disponible, False en caso contrario.
+        """
+        if not self.driver:
+            return False
+        
+        self._ventanas_verificadas = self._obtener_ventanas()
+        return self._ventanas_verificadas is not None
+    
+    def _obtener_ventanas(self) -> Optional[List[str]]:
+        """
+        Obtiene las ventanas abiertas, reintentando la conexión si hay problemas.
+        
+        Returns:
+            Lista de identificadores de ventana (vacía tras reconectar), o None
+            si no se pudo reconectar.
+        """
+        try:
+            return self.driver.window_handles
+        except Exception:
+            logging.error("Error al obtener ventanas. Reintentando conexión...")
+            if not self.inicializar_navegador():
+                return None
+            return []
+    
+    def pausar_videos(self) -> bool:
+        """
+        Pausa los videos de la pestaña actual para reutilizarla con el siguiente video.
+        
+        Returns:
+            bool: True si se pausaron correctamente, False en caso contrario.
+        """
+        if not self.driver:
+            return False
+        
+        try:
+            self.driver.execute_script(
+                "document.querySelectorAll('video').forEach(function(v) { v.pause(); });"
+            )
+            logging.info("✓ Video pausado. La pestaña se reutilizará para el siguiente video")
+            return True
+        except Exception as e:
+            logging.warning(f"Error al pausar video: {e}")
+            return False
+    
+    def descartar_pestaña_videos(self) -> None:
+        """
+        Descarta la pestaña de videos tras un fallo de carga.
+        
+        La cierra si hay otras pestañas abiertas; en cualquier caso, el siguiente
+        video se abrirá en una pestaña nueva.
+        """
+        if not self.driver:
+            return
+        
+        try:
+            if len(self.driver.window_handles) > 1:
+                self.cerrar_pestaña_actual()
+        except Exception as e:
+            logging.warning(f"Error al descartar pestaña: {e}")
+        self.pestaña_videos = None
+    
     def cerrar_pestaña_actual(self) -> bool:
         """
         Cierra la pestaña actual del navegador.
@@ -123,7 +207,7 @@ class BrowserManager:
             logging.info(f"Cerrando pestaña actual. Pestañas restantes: {len(ventanas_actuales)}")
             
             self.driver.close()
-            time.sleep(1)
+            self.pestaña_videos = None
             
             # Cambiar a otra pestaña si existe
             ventanas_restantes = self.driver.window_handles
@@ -159,6 +243,7 @@ class BrowserManager:
                 self.driver = None
                 self.browser_info = None
                 self.browser_controls = None
+                self.pestaña_videos = None
     
     # Métodos delegados a BrowserInfo
     def obtener_titulo_video(self) -> Optional[str]:
@@ -191,7 +276,7 @@ class BrowserManager:
         if self.browser_controls:
             self.browser_controls.salir_pantalla_completa()
     
-    def monitorear_reproduccion(self, duracion_segundos: int, intervalo: int = 2) -> None:
+    def monitorear_reproduccion(self, duracion_segundos: int, intervalo: int = 5) -> None:
         """Monitorea la reproducción. Delega a BrowserControls."""
         if self.browser_controls:
             self.browser_controls.monitorear_reproduccion(duracion_segundos, intervalo)
@@ -9,7 +9,6 @@ Este módulo se encarga de:
 
 import time
 import logging
-from typing import Optional
 from selenium.webdriver.common.by import By
 from selenium import webdriver
 
@@ -62,11 +61,44 @@ SELECTORES_POPUPS = [
     "ytd-popup-container #dismiss-button",
 ]
 
+SELECTORES_SKIP = (
+    "button.ytp-ad-skip-button",
+    ".ytp-ad-skip-button",
+    "button[aria-label*='Omitir']",
+    "button[aria-label*='Skip']",
+    ".ytp-ad-overlay-close-button",
+    "button.ytp-ad-skip-button-modern",
+)
+
+# Devuelve, para cada selector, el primer elemento visible y habilitado
+# (sin repetir elementos ya devueltos por un selector anterior)
+JS_BUSCAR_POPUPS = """
+    var encontrados = [];
+    var vistos = new Set();
+    arguments[0].forEach(function(selector) {
+        var elementos = document.querySelectorAll(selector);
+        for (var i = 0; i < elementos.length; i++) {
+            var el = elementos[i];
+            if (vistos.has(el) || el.disabled || el.getClientRects().length === 0 ||
+                    getComputedStyle(el).visibility === 'hidden') {
+                continue;
+            }
+            vistos.add(el);
+            encontrados.push({selector: selector, elemento: el});
+            break;
+        }
+    });
+    return encontrados;
+"""
+
 
 def cerrar_popups_youtube(driver: webdriver.Chrome, max_intentos: int = 5, silencioso: bool = False) -> bool:
     """
     Cierra todos los tipos de popups, banners y anuncios de YouTube.
     
+    Los popups visibles se localizan con una única llamada de JavaScript por
+    intento en lugar de una búsqueda por selector.
+    
     Args:
         driver: Instancia de WebDriver.
         max_intentos: Número máximo de intentos para cerrar popups.
@@ -83,35 +115,34 @@ def cerrar_popups_youtube(driver: webdriver.Chrome, max_intentos: int = 5, silen
     for intento in range(max_intentos):
         popups_encontrados = False
         
-        for selector in SELECTORES_POPUPS:
+        try:
+            candidatos = driver.execute_script(JS_BUSCAR_POPUPS, SELECTORES_POPUPS) or []
+        except:
+            break
+        
+        for candidato in candidatos:
+            selector = candidato['selector']
+            elemento = candidato['elemento']
             try:
-                elementos = driver.find_elements(By.CSS_SELECTOR, selector)
-                for elemento in elementos:
-                    try:
-                        if elemento.is_displayed() and elemento.is_enabled():
-                            driver.execute_script("arguments[0].scrollIntoView(true);", elemento)
-                            time.sleep(0.2)
-                            
-                            elemento.click()
-                            if not silencioso:
-                                logging.info(f"Popup cerrado: {selector[:50]}...")
-                            popups_cerrados += 1
-                            popups_encontrados = True
-                            time.sleep(0.5)
-                            break
-                    except:
-                        try:
-                            driver.execute_script("arguments[0].click();", elemento)
-                            if not silencioso:
-                                logging.info(f"Popup cerrado (JS): {selector[:50]}...")
-                            popups_cerrados += 1
-                            popups_encontrados = True
-                            time.sleep(0.5)
-                            break
-                        except:
-                            continue
+                driver.execute_script("arguments[0].scrollIntoView(true);", elemento)
+                time.sleep(0.2)
+                
+                elemento.click()
+                if not silencioso:
+                    logging.info(f"Popup cerrado: {selector[:50]}...")
+                popups_cerrados += 1
+                popups_encontrados = True
+                time.sleep(0.5)
             except:
-                continue
+                try:
+                    driver.execute_script("arguments[0].click();", elemento)
+                    if not silencioso:
+                        logging.info(f"Popup cerrado (JS): {selector[:50]}...")
+                    popups_cerrados += 1
+                    popups_encontrados = True
+                    time.sleep(0.5)
+                except:
+                    continue
         
         if not popups_encontrados:
             break
@@ -140,18 +171,9 @@ def intentar_omitir_anuncios(driver: webdriver.Chrome, max_intentos: int = 10) -
     if not driver:
         return False
     
-    selectores_skip = [
-        "button.ytp-ad-skip-button",
-        ".ytp-ad-skip-button",
-        "button[aria-label*='Omitir']",
-        "button[aria-label*='Skip']",
-        ".ytp-ad-overlay-close-button",
-        "button.ytp-ad-skip-button-modern"
-    ]
-    
     for intento in range(max_intentos):
         try:
-            for selector in selectores_skip:
+            for selector in SELECTORES_SKIP:
                 try:
                     boton_skip = driver.find_element(By.CSS_SELECTOR, selector)
                     if boton_skip.is_displayed():
@@ -2,26 +2,31 @@
 Módulo para cargar URLs en el navegador.
 
 Este módulo se encarga de:
-- Cargar URLs en nuevas pestañas
+- Cargar URLs en nuevas pestañas o en la pestaña actual
 - Verificar carga completa de páginas
 - Validar que estamos en YouTube
 """
 
 import time
 import logging
-from typing import Optional
+import traceback
 from selenium import webdriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from utils import registrar_banner
 
 
-def cargar_url_en_navegador(driver: webdriver.Chrome, url: str) -> bool:
+def cargar_url_en_navegador(driver: webdriver.Chrome, url: str, reutilizar_pestaña: bool = False) -> bool:
     """
     Carga una URL en el navegador.
     
     Args:
         driver: Instancia de WebDriver.
         url: La URL a cargar.
+        reutilizar_pestaña: Si es True, navega en la pestaña actual con driver.get()
+            en lugar de abrir una nueva pestaña.
     
     Returns:
         bool: True si la carga fue exitosa, False en caso contrario.
@@ -32,42 +37,15 @@ def cargar_url_en_navegador(driver: webdriver.Chrome, url: str) -> bool:
     
     try:
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("VERIFICACIÓN: Cargando video en navegador...")
-        logging.info("=" * 70)
+        registrar_banner("VERIFICACIÓN: Cargando video en navegador...")
         logging.info(f"URL: {url}")
         
-        # Obtener ventanas antes de abrir nueva pestaña
-        try:
-            ventanas_antes = driver.window_handles
-            logging.info(f"Ventanas abiertas antes: {len(ventanas_antes)}")
-        except:
-            logging.error("Error al obtener ventanas.")
-            return False
-        
-        # Intentar abrir en nueva pestaña
-        try:
-            driver.execute_script(f"window.open('{url}', '_blank');")
-            time.sleep(2)
-            
-            # Verificar que se creó una nueva pestaña
-            ventanas_despues = driver.window_handles
-            logging.info(f"Ventanas antes: {len(ventanas_antes)}, después: {len(ventanas_despues)}")
-            
-            if len(ventanas_despues) > len(ventanas_antes):
-                nueva_ventana = [w for w in ventanas_despues if w not in ventanas_antes][0]
-                driver.switch_to.window(nueva_ventana)
-                logging.info("✓ Nueva pestaña creada y activada")
-            elif len(ventanas_despues) > 0:
-                driver.switch_to.window(ventanas_despues[-1])
-                logging.info("✓ Usando última pestaña disponible")
-            else:
-                logging.warning("No se pudo abrir nueva pestaña. Usando driver.get()...")
-                driver.get(url)
-        except Exception as e:
-            logging.warning(f"Error al abrir nueva pestaña: {e}")
-            logging.info("Intentando con driver.get() directamente...")
+        if reutilizar_pestaña:
             driver.get(url)
+            logging.info("✓ URL cargada en la pestaña actual")
+        else:
+            if not _abrir_en_nueva_pestaña(driver, url):
+                return False
         
         # Esperar a que la página cargue completamente
         wait = WebDriverWait(driver, 30)
@@ -86,15 +64,65 @@ def cargar_url_en_navegador(driver: webdriver.Chrome, url: str) -> bool:
         
         logging.info(f"✓ Confirmado: Estamos en YouTube ({url_actual[:50]}...)")
         
-        # Esperar adicional para que YouTube cargue completamente
-        time.sleep(5)
-        logging.info("✓ Tiempo de espera adicional completado")
+        # Esperar a que exista el elemento <video> en lugar de una pausa fija.
+        # No es un error: si tarda, se continúa igual que con la pausa anterior.
+        try:
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "video"))
+            )
+            logging.info("✓ Reproductor de YouTube disponible")
+        except TimeoutException:
+            logging.warning("El reproductor de YouTube aún no está disponible. Continuando...")
         
         return True
     
     except Exception as e:
         logging.error(f"ERROR al cargar URL: {e}")
-        import traceback
         logging.error(f"Traceback: {traceback.format_exc()}")
         return False
 
+
+def _abrir_en_nueva_pestaña(driver: webdriver.Chrome, url: str) -> bool:
+    """
+    Abre la URL en una nueva pestaña y cambia el control a ella.
+    
+    Args:
+        driver: Instancia de WebDriver.
+        url: La URL a cargar.
+    
+    Returns:
+        bool: True si se pudo abrir la URL, False en caso contrario.
+    """
+    # Obtener ventanas antes de abrir nueva pestaña
+    try:
+        ventanas_antes = driver.window_handles
+        logging.info(f"Ventanas abiertas antes: {len(ventanas_antes)}")
+    except:
+        logging.error("Error al obtener ventanas.")
+        return False
+    
+    # Intentar abrir en nueva pestaña
+    try:
+        driver.execute_script(f"window.open('{url}', '_blank');")
+        time.sleep(2)
+        
+        # Verificar que se creó una nueva pestaña
+        ventanas_despues = driver.window_handles
+        logging.info(f"Ventanas antes: {len(ventanas_antes)}, después: {len(ventanas_despues)}")
+        
+        if len(ventanas_despues) > len(ventanas_antes):
+            nueva_ventana = [w for w in ventanas_despues if w not in ventanas_antes][0]
+            driver.switch_to.window(nueva_ventana)
+            logging.info("✓ Nueva pestaña creada y activada")
+        elif len(ventanas_despues) > 0:
+            driver.switch_to.window(ventanas_despues[-1])
+            logging.info("✓ Usando última pestaña disponible")
+        else:
+            logging.warning("No se pudo abrir nueva pestaña. Usando driver.get()...")
+            driver.get(url)
+    except Exception as e:
+        logging.warning(f"Error al abrir nueva pestaña: {e}")
+        logging.info("Intentando con driver.get() directamente...")
+        driver.get(url)
+    
+    return True
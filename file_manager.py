@@ -8,12 +8,15 @@ Este módulo se encarga de:
 - Actualizar estadísticas
 """
 
+import os
 import time
 import logging
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import config
-from utils import sanitizar_nombre_archivo, formatear_tamaño
+from utils import SEPARADOR, registrar_banner, sanitizar_nombre_archivo, formatear_tamaño
 
 
 class FileManager:
@@ -31,14 +34,123 @@ class FileManager:
             estadisticas: Diccionario compartido para almacenar estadísticas.
         """
         self.estadisticas = estadisticas
+        # Sufijo de los archivos en modo prueba (fijo durante toda la ejecución)
+        self._sufijo_prueba = "_PRUEBA" if config.MODO_PRUEBA else ""
+        # Hilo para gestionar archivos mientras se graba el siguiente video
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pendientes: List[Future] = []
+    
+    def gestionar_archivo_en_segundo_plano(
+        self,
+        ruta_original: Path,
+        ruta_modulo: Path,
+        nombre_base: str,
+        duracion_segundos: int,
+        etiqueta: str
+    ) -> Future:
+        """
+        Gestiona el archivo grabado en un hilo secundario.
+        
+        Esperar a que OBS cierre el archivo y moverlo no depende del navegador,
+        por lo que el siguiente video puede empezar mientras tanto. Se usa un
+        único hilo para que los archivos se gestionen en orden y las estadísticas
+        no se actualicen desde varios hilos a la vez.
+        
+        Los mensajes del hilo secundario se mezclan con los del siguiente video,
+        por eso todos incluyen la etiqueta del video al que pertenecen.
+        
+        Args:
+            ruta_original: Ruta original del archivo grabado.
+            ruta_modulo: Carpeta del módulo donde guardar el archivo.
+            nombre_base: Nombre final del archivo sin extensión.
+            duracion_segundos: Duración del video en segundos.
+            etiqueta: Identificación del video en el log (p. ej. "video 3/10 (03_Titulo)").
+        
+        Returns:
+            Future con el resultado (True si el archivo se guardó correctamente).
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archivos")
+        
+        # Olvidar los ya terminados (los fallos quedan en las estadísticas)
+        self._pendientes = [f for f in self._pendientes if not f.done()]
+        
+        futuro = self._executor.submit(
+            self._gestionar_y_registrar,
+            ruta_original,
+            ruta_modulo,
+            nombre_base,
+            duracion_segundos,
+            etiqueta
+        )
+        self._pendientes.append(futuro)
+        return futuro
+    
+    def _gestionar_y_registrar(
+        self,
+        ruta_original: Path,
+        ruta_modulo: Path,
+        nombre_base: str,
+        duracion_segundos: int,
+        etiqueta: str
+    ) -> bool:
+        """
+        Gestiona el archivo en el hilo secundario y registra el resultado del video.
+        
+        Los videos cuyo archivo no se pudo guardar se añaden a
+        estadisticas['archivos_no_guardados'] para mostrarlos en el resumen final.
+        
+        Returns:
+            bool: True si el archivo se guardó correctamente.
+        """
+        try:
+            guardado = self.gestionar_archivo_grabado(
+                ruta_original, ruta_modulo, nombre_base, duracion_segundos, etiqueta
+            )
+        except Exception as e:
+            logging.error(f"ERROR al guardar el archivo del {etiqueta}: {e}")
+            logging.error(f"Traceback: {traceback.format_exc()}")
+            guardado = False
+        
+        if guardado:
+            logging.info(f"✓ Archivo del {etiqueta} guardado")
+        else:
+            logging.error(f"ERROR: No se pudo guardar el archivo del {etiqueta}")
+            self.estadisticas.setdefault('archivos_no_guardados', []).append(etiqueta)
+        return guardado
+    
+    def esperar_archivos_pendientes(self) -> int:
+        """
+        Espera a que terminen los archivos que se están gestionando en segundo plano.
+        
+        Debe llamarse antes de leer las estadísticas (p. ej. en el resumen final).
+        
+        Returns:
+            int: Número total de archivos que no se pudieron guardar en segundo plano.
+        """
+        pendientes, self._pendientes = self._pendientes, []
+        if pendientes:
+            logging.info(f"Esperando a que se guarden {len(pendientes)} archivo(s) pendiente(s)...")
+        
+        for futuro in pendientes:
+            futuro.result()
+        
+        return len(self.estadisticas.get('archivos_no_guardados', ()))
+    
+    def cerrar(self) -> None:
+        """Espera los archivos pendientes y libera el hilo secundario."""
+        self.esperar_archivos_pendientes()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
     
     def gestionar_archivo_grabado(
         self,
         ruta_original: Path,
         ruta_modulo: Path,
-        titulo_video: str,
-        numero_video: int,
-        duracion_segundos: int
+        nombre_base: str,
+        duracion_segundos: int,
+        etiqueta: str = ""
     ) -> bool:
         """
         Gestiona el archivo grabado: lo renombra y lo mueve a la ubicación correcta.
@@ -46,79 +158,113 @@ class FileManager:
         Args:
             ruta_original: Ruta original del archivo grabado.
             ruta_modulo: Carpeta del módulo donde guardar el archivo.
-            titulo_video: Título del video.
-            numero_video: Número del video en el módulo.
+            nombre_base: Nombre final del archivo sin extensión
+                (ver generar_nombre_base).
             duracion_segundos: Duración del video en segundos.
+            etiqueta: Identificación del video para el log (opcional).
         
         Returns:
             bool: True si se gestionó correctamente, False en caso contrario.
         """
+        sufijo_log = f" ({etiqueta})" if etiqueta else ""
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("VERIFICACIÓN: Guardando archivo grabado...")
-        logging.info("=" * 70)
-        
-        time.sleep(2)  # Pausa para que OBS libere el archivo
+        registrar_banner(f"VERIFICACIÓN: Guardando archivo grabado...{sufijo_log}")
         
-        # Verificar que el archivo existe
+        # Esperar a que OBS termine de escribir el archivo
         if not self._esperar_archivo(ruta_original):
-            logging.error(f"ERROR: El archivo no se encontró después de esperar: {ruta_original}")
+            logging.error(f"ERROR: El archivo no se encontró después de esperar{sufijo_log}: {ruta_original}")
             return False
         
         try:
             logging.info(f"✓ Archivo encontrado: {ruta_original}")
             
             # Generar nuevo nombre y ruta
-            nueva_ruta = self._generar_ruta_archivo(
-                ruta_original, ruta_modulo, titulo_video, numero_video
-            )
+            nueva_ruta = self._generar_ruta_archivo(ruta_original, ruta_modulo, nombre_base)
             
-            # Sobreescribir si el archivo ya existe
-            if nueva_ruta.exists():
-                self._eliminar_archivo_existente(nueva_ruta)
-            
-            # Renombrar y mover el archivo
+            # Renombrar y mover el archivo (sobreescribe si ya existe)
             if self._renombrar_archivo(ruta_original, nueva_ruta, duracion_segundos):
-                logging.info("=" * 70)
+                logging.info(SEPARADOR)
                 return True
             else:
                 return False
         
         except Exception as e:
-            logging.error(f"ERROR al gestionar archivo: {e}")
-            import traceback
+            logging.error(f"ERROR al gestionar archivo{sufijo_log}: {e}")
             logging.error(f"Traceback: {traceback.format_exc()}")
             return False
     
-    def _esperar_archivo(self, ruta: Path, max_intentos: int = 5) -> bool:
+    def _esperar_archivo(
+        self,
+        ruta: Path,
+        timeout: float = 12.0,
+        ventana_estable: float = 1.5,
+        intervalo: float = 0.25
+    ) -> bool:
         """
-        Espera a que un archivo exista.
+        Espera a que un archivo exista y su tamaño deje de cambiar.
+        
+        Se considera listo cuando su tamaño no cambia durante ventana_estable
+        segundos seguidos. Igual que antes, basta con que el archivo exista:
+        un archivo vacío se acepta, y si al agotarse el tiempo sigue creciendo
+        se acepta con una advertencia (el renombrado reintenta si OBS aún lo
+        tiene abierto).
         
         Args:
             ruta: Ruta del archivo a esperar.
-            max_intentos: Número máximo de intentos.
+            timeout: Tiempo máximo de espera en segundos.
+            ventana_estable: Segundos que el tamaño debe mantenerse sin cambios.
+            intervalo: Segundos entre lecturas del tamaño.
         
         Returns:
-            bool: True si el archivo existe, False en caso contrario.
+            bool: True si el archivo existe, False si no apareció a tiempo.
         """
-        if ruta.exists():
-            return True
+        limite = time.monotonic() + timeout
+        tamaño_anterior = None
+        estable_desde = 0.0
         
-        logging.warning(f"El archivo {ruta} no existe. Esperando más tiempo...")
-        for espera in range(max_intentos):
-            time.sleep(2)
-            if ruta.exists():
-                return True
-            logging.info(f"Esperando archivo... ({espera + 1}/{max_intentos})")
+        while True:
+            ahora = time.monotonic()
+            try:
+                tamaño = ruta.stat().st_size
+            except FileNotFoundError:
+                tamaño = None
+            
+            if tamaño is not None:
+                if tamaño != tamaño_anterior:
+                    estable_desde = ahora
+                elif ahora - estable_desde >= ventana_estable:
+                    return True
+            tamaño_anterior = tamaño
+            
+            if ahora >= limite:
+                if tamaño is not None:
+                    logging.warning(f"ADVERTENCIA: El tamaño de {ruta.name} sigue cambiando. Continuando de todas formas...")
+                    return True
+                return False
+            time.sleep(intervalo)
+    
+    def generar_nombre_base(self, titulo_video: str, numero_video: int) -> str:
+        """
+        Genera el nombre final del archivo (sin extensión) a partir del título.
+        
+        Se llama en cuanto se conoce el título, durante la grabación, para que al
+        detener la grabación el nombre ya esté calculado.
+        
+        Args:
+            titulo_video: Título del video.
+            numero_video: Número del video.
         
-        return False
+        Returns:
+            str: Nombre del archivo sin extensión.
+        """
+        nombre_archivo_saneado = sanitizar_nombre_archivo(titulo_video)
+        return f"{numero_video:02d}_{nombre_archivo_saneado}{self._sufijo_prueba}"
     
     def _generar_ruta_archivo(
         self,
         ruta_original: Path,
         ruta_modulo: Path,
-        titulo_video: str,
-        numero_video: int
+        nombre_base: str
     ) -> Path:
         """
         Genera la ruta completa del archivo renombrado.
@@ -126,34 +272,12 @@ class FileManager:
         Args:
             ruta_original: Ruta original del archivo.
             ruta_modulo: Carpeta del módulo.
-            titulo_video: Título del video.
-            numero_video: Número del video.
+            nombre_base: Nombre del archivo sin extensión.
         
         Returns:
             Path: Ruta completa del archivo renombrado.
         """
-        extension = ruta_original.suffix
-        nombre_archivo_saneado = sanitizar_nombre_archivo(titulo_video)
-        
-        # Agregar sufijo en modo prueba
-        sufijo_prueba = "_PRUEBA" if config.MODO_PRUEBA else ""
-        nuevo_nombre = f"{numero_video:02d}_{nombre_archivo_saneado}{sufijo_prueba}{extension}"
-        
-        return ruta_modulo / nuevo_nombre
-    
-    def _eliminar_archivo_existente(self, ruta: Path) -> None:
-        """
-        Elimina un archivo existente si es necesario.
-        
-        Args:
-            ruta: Ruta del archivo a eliminar.
-        """
-        try:
-            logging.info(f"ADVERTENCIA: El archivo '{ruta.name}' ya existe. Sobreescribiendo...")
-            ruta.unlink()
-            logging.info("✓ Archivo existente eliminado")
-        except Exception as e:
-            logging.warning(f"No se pudo eliminar archivo existente: {e}")
+        return ruta_modulo / f"{nombre_base}{ruta_original.suffix}"
     
     def _renombrar_archivo(
         self,
@@ -164,6 +288,9 @@ class FileManager:
         """
         Renombra y mueve el archivo a la nueva ubicación.
         
+        Usa os.replace, que sobreescribe de forma atómica un archivo existente
+        con el mismo nombre tanto en Windows como en POSIX.
+        
         Args:
             ruta_original: Ruta original del archivo.
             nueva_ruta: Nueva ruta del archivo.
@@ -173,31 +300,64 @@ class FileManager:
             bool: True si se renombró correctamente, False en caso contrario.
         """
         try:
-            ruta_original.rename(nueva_ruta)
+            self._reemplazar_archivo(ruta_original, nueva_ruta)
             logging.info(f"✓ Archivo renombrado y guardado: {nueva_ruta.name}")
             
             # Verificar que el archivo se guardó correctamente
-            if nueva_ruta.exists():
+            try:
                 tamaño_archivo = nueva_ruta.stat().st_size
-                logging.info(f"✓ Archivo verificado: {formatear_tamaño(tamaño_archivo)}")
-                
-                # Actualizar estadísticas
-                self.estadisticas['videos_grabados'] += 1
-                self.estadisticas['duracion_total_segundos'] += duracion_segundos
-                self.estadisticas['tamaño_total_bytes'] += tamaño_archivo
-                self.estadisticas['archivos_grabados'].append(nueva_ruta)
-                
-                return True
-            else:
+            except FileNotFoundError:
                 logging.error("ERROR CRÍTICO: El archivo no existe después de renombrar")
                 return False
+            
+            logging.info(f"✓ Archivo verificado: {formatear_tamaño(tamaño_archivo)}")
+            
+            # Actualizar estadísticas
+            estadisticas = self.estadisticas
+            estadisticas['videos_grabados'] += 1
+            estadisticas['duracion_total_segundos'] += duracion_segundos
+            estadisticas['tamaño_total_bytes'] += tamaño_archivo
+            estadisticas['archivos_grabados'].append(nueva_ruta)
+            
+            return True
         
         except Exception as e:
             logging.error(f"ERROR CRÍTICO al renombrar archivo: {e}")
-            import traceback
             logging.error(f"Traceback: {traceback.format_exc()}")
             return False
     
+    def _reemplazar_archivo(
+        self,
+        ruta_original: Path,
+        nueva_ruta: Path,
+        intentos: int = 5,
+        espera: float = 1.0
+    ) -> None:
+        """
+        Mueve el archivo con os.replace, reintentando si está bloqueado.
+        
+        En Windows os.replace falla con PermissionError mientras OBS mantiene
+        el archivo abierto; se reintenta unos segundos antes de darlo por fallido.
+        
+        Args:
+            ruta_original: Ruta original del archivo.
+            nueva_ruta: Nueva ruta del archivo.
+            intentos: Número máximo de intentos.
+            espera: Segundos entre intentos.
+        
+        Raises:
+            PermissionError: Si el archivo sigue bloqueado tras todos los intentos.
+        """
+        for intento in range(1, intentos + 1):
+            try:
+                os.replace(ruta_original, nueva_ruta)
+                return
+            except PermissionError:
+                if intento == intentos:
+                    raise
+                logging.warning(f"El archivo sigue en uso. Reintentando ({intento}/{intentos})...")
+                time.sleep(espera)
+    
     def buscar_archivo_reciente(self, directorio: Path) -> Optional[Path]:
         """
         Busca el archivo más reciente en un directorio.
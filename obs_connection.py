@@ -8,10 +8,12 @@ Este módulo se encarga de:
 """
 
 import logging
+import traceback
 from typing import Optional
 import obsws_python as obs
 from obsws_python.error import OBSSDKError
 import config
+from utils import SEPARADOR, registrar_banner
 
 
 def conectar_obs() -> Optional[obs.ReqClient]:
@@ -21,9 +23,7 @@ def conectar_obs() -> Optional[obs.ReqClient]:
     Returns:
         obs.ReqClient si la conexión fue exitosa, None en caso contrario.
     """
-    logging.info("=" * 70)
-    logging.info("VERIFICACIÓN: Conectando con OBS Studio...")
-    logging.info("=" * 70)
+    registrar_banner("VERIFICACIÓN: Conectando con OBS Studio...")
     
     try:
         password_info = "con contraseña" if config.OBS_PASSWORD else "sin contraseña"
@@ -41,14 +41,12 @@ def conectar_obs() -> Optional[obs.ReqClient]:
         logging.info(f"✓ Conexión con OBS exitosa")
         logging.info(f"  - Versión de OBS: {version.obs_version}")
         logging.info(f"  - Versión del plugin WebSocket: {version.obs_web_socket_version}")
-        logging.info("=" * 70)
+        logging.info(SEPARADOR)
         
         return cliente_obs
     
     except ConnectionRefusedError:
-        logging.error("=" * 70)
-        logging.error("ERROR: No se pudo conectar a OBS Studio")
-        logging.error("=" * 70)
+        registrar_banner("ERROR: No se pudo conectar a OBS Studio", nivel=logging.ERROR)
         logging.error("")
         logging.error("VERIFICA QUE:")
         logging.error("  1. OBS Studio esté abierto")
@@ -59,26 +57,21 @@ def conectar_obs() -> Optional[obs.ReqClient]:
             logging.error(f"  3. La contraseña en config.py sea correcta (actualmente configurada)")
         else:
             logging.error("  3. Si configuraste una contraseña en OBS, agrega 'OBS_PASSWORD' en config.py")
-        logging.error("=" * 70)
+        logging.error(SEPARADOR)
         return None
     
     except OBSSDKError as e:
-        logging.error("=" * 70)
-        logging.error(f"ERROR: Error del SDK de OBS: {e}")
-        logging.error("=" * 70)
+        registrar_banner(f"ERROR: Error del SDK de OBS: {e}", nivel=logging.ERROR)
         logging.error("")
         logging.error("Posibles causas:")
         logging.error("  - Contraseña incorrecta")
         logging.error("  - Plugin obs-websocket no instalado")
         logging.error("  - Versión incompatible de OBS o del plugin")
-        logging.error("=" * 70)
+        logging.error(SEPARADOR)
         return None
     
     except Exception as e:
-        logging.error("=" * 70)
-        logging.error(f"ERROR inesperado al conectar con OBS: {e}")
-        logging.error("=" * 70)
-        import traceback
+        registrar_banner(f"ERROR inesperado al conectar con OBS: {e}", nivel=logging.ERROR)
         logging.error(f"Traceback: {traceback.format_exc()}")
         return None
 
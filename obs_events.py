@@ -0,0 +1,170 @@
+"""
+Módulo para seguir el estado de grabación de OBS mediante eventos.
+
+Este módulo se encarga de:
+- Suscribirse al evento RecordStateChanged de obs-websocket
+- Mantener una copia local del estado de grabación
+- Esperar cambios de estado sin consultar a OBS
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+import obsws_python as obs
+import config
+
+
+# Estados de salida de RecordStateChanged que cierran una transición
+ESTADO_SALIDA_INICIADA = "OBS_WEBSOCKET_OUTPUT_STARTED"
+ESTADO_SALIDA_DETENIDA = "OBS_WEBSOCKET_OUTPUT_STOPPED"
+# Estados con la grabación en curso (pausada o no)
+ESTADOS_SALIDA_ACTIVA = (
+    ESTADO_SALIDA_INICIADA,
+    "OBS_WEBSOCKET_OUTPUT_PAUSED",
+    "OBS_WEBSOCKET_OUTPUT_RESUMED",
+)
+
+# Cada cuánto comprobar, durante una espera, si el cliente de eventos sigue conectado
+INTERVALO_COMPROBACION_EVENTOS = 0.5
+
+
+class EstadoGrabacion:
+    """
+    Copia local del estado de grabación de OBS actualizada por eventos.
+    
+    Expone los mismos atributos que la respuesta de get_record_status()
+    (output_active, output_path), por lo que puede usarse en su lugar sin
+    hacer una consulta por el WebSocket.
+    
+    A diferencia de get_record_status(), output_active solo pasa a False con
+    OBS_WEBSOCKET_OUTPUT_STOPPED: durante OBS_WEBSOCKET_OUTPUT_STOPPING OBS
+    aún está escribiendo el archivo.
+    """
+    
+    def __init__(self, cliente_eventos: obs.EventClient, output_active: bool = False):
+        """
+        Inicializa el estado de grabación y lo registra en el cliente de eventos.
+        
+        Args:
+            cliente_eventos: Cliente de eventos de OBS ya conectado.
+            output_active: Estado inicial de la grabación.
+        """
+        self.output_active = output_active
+        self.output_path: Optional[str] = None
+        self._condicion = threading.Condition()
+        self._cliente_eventos: Optional[obs.EventClient] = cliente_eventos
+        cliente_eventos.callback.register(self.on_record_state_changed)
+    
+    def on_record_state_changed(self, data) -> None:
+        """
+        Callback del evento RecordStateChanged (se ejecuta en el hilo del EventClient).
+        
+        Los estados intermedios (STARTING, STOPPING) no cambian output_active.
+        
+        Args:
+            data: Datos del evento enviados por obs-websocket.
+        """
+        estado_salida = getattr(data, 'output_state', None)
+        with self._condicion:
+            if estado_salida == ESTADO_SALIDA_DETENIDA:
+                self.output_active = False
+            elif estado_salida in ESTADOS_SALIDA_ACTIVA:
+                self.output_active = True
+            elif estado_salida is None:
+                # Sin output_state (versiones antiguas): usar output_active
+                self.output_active = bool(getattr(data, 'output_active', False))
+            
+            ruta = getattr(data, 'output_path', None)
+            if ruta:
+                self.output_path = ruta
+            self._condicion.notify_all()
+    
+    def eventos_activos(self) -> bool:
+        """
+        Indica si el cliente de eventos sigue conectado.
+        
+        Si se ha desconectado, el estado local deja de actualizarse y se debe
+        consultar el estado directamente a OBS.
+        
+        Returns:
+            bool: True si el estado local sigue siendo fiable.
+        """
+        cliente = self._cliente_eventos
+        if cliente is None:
+            return False
+        hilo = getattr(cliente, 'worker', None)
+        if hilo is not None and not hilo.is_alive():
+            return False
+        return bool(getattr(cliente, 'running', True))
+    
+    def esperar(self, activo: bool, timeout: float) -> bool:
+        """
+        Espera a que la grabación alcance el estado indicado.
+        
+        Deja de esperar si el cliente de eventos se desconecta, ya que entonces
+        no llegarán más notificaciones.
+        
+        Args:
+            activo: Estado esperado (True = grabando, False = detenida).
+            timeout: Tiempo máximo de espera en segundos.
+        
+        Returns:
+            bool: True si se alcanzó el estado, False si se agotó el tiempo o
+            se perdió la conexión de eventos.
+        """
+        limite = time.monotonic() + timeout
+        with self._condicion:
+            while self.output_active != activo:
+                restante = limite - time.monotonic()
+                if restante <= 0 or not self.eventos_activos():
+                    return False
+                self._condicion.wait(min(restante, INTERVALO_COMPROBACION_EVENTOS))
+            return True
+    
+    def cerrar(self) -> None:
+        """Cierra la suscripción a eventos de OBS."""
+        if self._cliente_eventos:
+            try:
+                self._cliente_eventos.disconnect()
+            except Exception as e:
+                logging.debug(f"Error al cerrar cliente de eventos de OBS: {e}")
+            self._cliente_eventos = None
+
+
+def suscribir_estado_grabacion(cliente_obs: obs.ReqClient) -> Optional[EstadoGrabacion]:
+    """
+    Crea un EstadoGrabacion suscrito a los eventos de grabación de OBS.
+    
+    Args:
+        cliente_obs: Cliente de OBS conectado (se usa para leer el estado inicial).
+    
+    Returns:
+        EstadoGrabacion si la suscripción fue exitosa, None en caso contrario
+        (en ese caso se debe consultar el estado directamente a OBS).
+    """
+    cliente_eventos = None
+    try:
+        cliente_eventos = obs.EventClient(
+            host=config.OBS_HOST,
+            port=config.OBS_PORT,
+            password=config.OBS_PASSWORD,
+            subs=obs.Subs.OUTPUTS,
+            timeout=10
+        )
+        
+        estado_inicial = cliente_obs.get_record_status()
+        estado = EstadoGrabacion(cliente_eventos, bool(getattr(estado_inicial, 'output_active', False)))
+        
+        logging.info("✓ Suscrito a los eventos de grabación de OBS")
+        return estado
+    
+    except Exception as e:
+        if cliente_eventos is not None:
+            try:
+                cliente_eventos.disconnect()
+            except Exception:
+                pass
+        logging.warning(f"No se pudo suscribir a los eventos de OBS: {e}")
+        logging.warning("Se consultará el estado de grabación directamente a OBS")
+        return None
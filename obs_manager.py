@@ -12,8 +12,9 @@ import logging
 from pathlib import Path
 from typing import Optional
 import obsws_python as obs
-import config
+from utils import SEPARADOR, registrar_banner
 from obs_connection import conectar_obs, verificar_conexion_obs
+from obs_events import EstadoGrabacion, suscribir_estado_grabacion
 from obs_recording import iniciar_grabacion_obs, detener_grabacion_obs, verificar_grabacion_activa, asegurar_grabacion_detenida
 
 
@@ -31,6 +32,8 @@ class OBSManager:
         """Inicializa el gestor de OBS."""
         self.cliente_obs: Optional[obs.ReqClient] = None
         self.conectado = False
+        self.estado_grabacion: Optional[EstadoGrabacion] = None
+        self._directorio_grabacion: Optional[Path] = None
     
     def conectar(self) -> bool:
         """
@@ -45,6 +48,10 @@ class OBSManager:
             return False
         
         self.conectado = True
+        self._directorio_grabacion = None
+        
+        # Seguir el estado de grabación por eventos en lugar de consultarlo
+        self.estado_grabacion = suscribir_estado_grabacion(self.cliente_obs)
         
         # Verificar configuración de audio después de conectar
         self.verificar_configuracion_audio()
@@ -64,6 +71,7 @@ class OBSManager:
         conexion_activa = verificar_conexion_obs(self.cliente_obs)
         if not conexion_activa:
             self.conectado = False
+            self._directorio_grabacion = None
         
         return conexion_activa
     
@@ -71,6 +79,9 @@ class OBSManager:
         """
         Configura el directorio donde OBS guardará las grabaciones.
         
+        Si el directorio es el mismo que se configuró en la llamada anterior,
+        no se vuelve a enviar a OBS.
+        
         Args:
             directorio: Ruta al directorio donde se guardarán las grabaciones.
         
@@ -81,9 +92,14 @@ class OBSManager:
             logging.error("ERROR: No hay conexión con OBS para configurar directorio")
             return False
         
+        if directorio == self._directorio_grabacion:
+            logging.info(f"✓ Directorio de grabación OBS sin cambios: {directorio}")
+            return True
+        
         try:
             directorio_str = str(directorio.resolve())
             self.cliente_obs.set_record_directory(directorio_str)
+            self._directorio_grabacion = directorio
             logging.info(f"✓ Directorio de grabación OBS configurado: {directorio}")
             return True
         
@@ -103,7 +119,7 @@ class OBSManager:
             logging.error("ERROR: No hay conexión con OBS para iniciar grabación")
             return False
         
-        return iniciar_grabacion_obs(self.cliente_obs)
+        return iniciar_grabacion_obs(self.cliente_obs, self.estado_grabacion)
     
     def detener_grabacion(self) -> Optional[Path]:
         """
@@ -116,7 +132,7 @@ class OBSManager:
             logging.error("ERROR: No hay conexión con OBS para detener grabación")
             return None
         
-        return detener_grabacion_obs(self.cliente_obs)
+        return detener_grabacion_obs(self.cliente_obs, self.estado_grabacion)
     
     def verificar_grabacion_activa(self) -> bool:
         """
@@ -128,18 +144,22 @@ class OBSManager:
         if not self.verificar_conexion():
             return False
         
-        return verificar_grabacion_activa(self.cliente_obs)
+        return verificar_grabacion_activa(self.cliente_obs, self.estado_grabacion)
     
-    def asegurar_grabacion_detenida(self) -> None:
+    def asegurar_grabacion_detenida(self, espera_inactiva: float = 0.0) -> None:
         """
         Asegura que no haya ninguna grabación activa.
         
         Si hay una grabación activa, la detiene.
+        
+        Args:
+            espera_inactiva: Segundos que se espera a que OBS quede inactivo por sí
+                solo antes de forzar la detención.
         """
         if not self.verificar_conexion():
             return
         
-        asegurar_grabacion_detenida(self.cliente_obs)
+        asegurar_grabacion_detenida(self.cliente_obs, self.estado_grabacion, espera_inactiva)
     
     def mostrar_informacion_escenas(self) -> None:
         """
@@ -174,9 +194,7 @@ class OBSManager:
         
         try:
             logging.info("")
-            logging.info("=" * 70)
-            logging.info("VERIFICACIÓN: Configuración de Audio en OBS")
-            logging.info("=" * 70)
+            registrar_banner("VERIFICACIÓN: Configuración de Audio en OBS")
             logging.info("")
             logging.info("IMPORTANTE: Para que solo se grabe el audio del navegador:")
             logging.info("")
@@ -194,7 +212,7 @@ class OBSManager:
             logging.info("4. El audio del navegador se capturará automáticamente")
             logging.info("   desde la captura de ventana si está configurado correctamente")
             logging.info("")
-            logging.info("=" * 70)
+            logging.info(SEPARADOR)
             logging.info("")
         
         except Exception as e:
@@ -205,6 +223,9 @@ class OBSManager:
         if self.cliente_obs:
             # Asegurar que no hay grabación activa
             self.asegurar_grabacion_detenida()
+            if self.estado_grabacion:
+                self.estado_grabacion.cerrar()
+                self.estado_grabacion = None
             self.cliente_obs = None
             self.conectado = False
             logging.info("✓ Desconectado de OBS Studio")
@@ -10,34 +10,108 @@ Este módulo se encarga de:
 
 import time
 import logging
+import traceback
 from pathlib import Path
 from typing import Optional
 import obsws_python as obs
+from obs_events import EstadoGrabacion
+from utils import SEPARADOR, registrar_banner
 
 
-def iniciar_grabacion_obs(cliente_obs: obs.ReqClient) -> bool:
+def obtener_estado_grabacion(
+    cliente_obs: obs.ReqClient,
+    estado: Optional[EstadoGrabacion] = None
+):
+    """
+    Obtiene el estado de grabación actual.
+    
+    Args:
+        cliente_obs: Cliente de OBS conectado.
+        estado: Estado local actualizado por eventos. Si se indica, se lee sin
+            consultar a OBS.
+    
+    Returns:
+        Objeto con el atributo output_active (y output_path si está disponible).
+    """
+    if estado is not None and estado.eventos_activos():
+        return estado
+    return cliente_obs.get_record_status()
+
+
+def esperar_estado_grabacion(
+    cliente_obs: obs.ReqClient,
+    activo: bool = True,
+    timeout: float = 5.0,
+    estado: Optional[EstadoGrabacion] = None
+):
+    """
+    Espera a que el estado de grabación de OBS coincida con el deseado.
+    
+    Si hay un estado local actualizado por eventos, espera la notificación del
+    evento. Si no (o si el cliente de eventos se desconecta durante la espera),
+    consulta el estado con espera exponencial (50 ms, 100 ms, 200 ms... hasta
+    un máximo de 500 ms entre consultas) y termina en cuanto coincide, en lugar
+    de esperar siempre el peor caso.
+    
+    Args:
+        cliente_obs: Cliente de OBS conectado.
+        activo: Estado esperado (True = grabando, False = detenida).
+        timeout: Tiempo máximo de espera en segundos.
+        estado: Estado local actualizado por eventos (opcional).
+    
+    Returns:
+        El último estado obtenido (puede no coincidir si se agotó el tiempo),
+        o None si no se pudo consultar.
+    """
+    limite = time.monotonic() + timeout
+    
+    if estado is not None and estado.eventos_activos():
+        if estado.esperar(activo, timeout) or estado.eventos_activos():
+            return estado
+        logging.warning("Se perdió la conexión de eventos de OBS. Consultando el estado directamente...")
+    
+    espera = 0.05
+    estado = None
+    
+    while True:
+        try:
+            estado = cliente_obs.get_record_status()
+            if getattr(estado, 'output_active', False) == activo:
+                return estado
+        except Exception as e:
+            logging.debug(f"Error al consultar estado de grabación: {e}")
+        
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            return estado
+        time.sleep(min(espera, restante))
+        espera = min(0.5, espera * 2)
+
+
+def iniciar_grabacion_obs(
+    cliente_obs: obs.ReqClient,
+    estado: Optional[EstadoGrabacion] = None
+) -> bool:
     """
     Inicia una grabación en OBS Studio.
     
     Args:
         cliente_obs: Cliente de OBS conectado.
+        estado: Estado local actualizado por eventos (opcional).
     
     Returns:
         bool: True si la grabación se inició correctamente, False en caso contrario.
     """
     try:
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("VERIFICACIÓN: Iniciando grabación en OBS...")
-        logging.info("=" * 70)
+        registrar_banner("VERIFICACIÓN: Iniciando grabación en OBS...")
         
         # Verificar que no hay grabación activa antes de iniciar
         try:
-            estado_antes = cliente_obs.get_record_status()
+            estado_antes = obtener_estado_grabacion(cliente_obs, estado)
             if estado_antes.output_active:
                 logging.warning("Hay una grabación activa. Deteniéndola antes de iniciar nueva...")
-                detener_grabacion_obs(cliente_obs)
-                time.sleep(2)
+                detener_grabacion_obs(cliente_obs, estado)
         except:
             pass
         
@@ -52,91 +126,72 @@ def iniciar_grabacion_obs(cliente_obs: obs.ReqClient) -> bool:
             logging.error(f"Error al ejecutar start_record(): {e_start}")
             logging.warning("Intentando continuar de todas formas...")
         
-        time.sleep(3)  # Esperar a que la grabación inicie completamente
-        
         # Verificar que la grabación se inició correctamente
-        intentos_verificacion = 0
-        grabacion_iniciada = False
+        estado_grabacion = esperar_estado_grabacion(cliente_obs, activo=True, timeout=8.0, estado=estado)
         
-        while intentos_verificacion < 10:
-            try:
-                estado_grabacion = cliente_obs.get_record_status()
-                
-                if hasattr(estado_grabacion, 'output_active') and estado_grabacion.output_active:
-                    grabacion_iniciada = True
-                    logging.info("✓ Grabación iniciada correctamente en OBS")
-                    logging.info(f"  - Estado output_active: {estado_grabacion.output_active}")
-                    
-                    if hasattr(estado_grabacion, 'output_paused'):
-                        logging.info(f"  - Estado output_paused: {estado_grabacion.output_paused}")
-                    if hasattr(estado_grabacion, 'output_timecode'):
-                        logging.info(f"  - Tiempo de grabación: {estado_grabacion.output_timecode}")
-                    
-                    logging.info("=" * 70)
-                    return True
-                else:
-                    logging.info(f"Intento {intentos_verificacion + 1}/10: Verificando estado de grabación...")
-                    intentos_verificacion += 1
-                    time.sleep(0.5)
+        if getattr(estado_grabacion, 'output_active', False):
+            logging.info("✓ Grabación iniciada correctamente en OBS")
+            logging.info(f"  - Estado output_active: {estado_grabacion.output_active}")
             
-            except Exception as e:
-                logging.warning(f"Error al verificar estado (intento {intentos_verificacion + 1}): {e}")
-                intentos_verificacion += 1
-                time.sleep(0.5)
-        
-        if not grabacion_iniciada:
+            if hasattr(estado_grabacion, 'output_paused'):
+                logging.info(f"  - Estado output_paused: {estado_grabacion.output_paused}")
+            if hasattr(estado_grabacion, 'output_timecode'):
+                logging.info(f"  - Tiempo de grabación: {estado_grabacion.output_timecode}")
+            
+            logging.info(SEPARADOR)
+        else:
             logging.warning("ADVERTENCIA: No se pudo verificar que la grabación se inició correctamente")
             logging.warning("Continuando de todas formas - la grabación puede estar activa aunque no se detecte")
             logging.warning("Si la grabación no funciona, verifica:")
             logging.warning("  1. OBS debe tener al menos una fuente configurada en la escena")
             logging.warning("  2. El formato de salida debe estar configurado en OBS")
             logging.warning("  3. Verifica los logs de OBS para más detalles")
-            logging.info("=" * 70)
+            logging.info(SEPARADOR)
         
         return True
     
     except Exception as e:
         logging.error(f"ERROR CRÍTICO al iniciar grabación: {e}")
-        import traceback
         logging.error(f"Traceback: {traceback.format_exc()}")
         return False
 
 
-def detener_grabacion_obs(cliente_obs: obs.ReqClient) -> Optional[Path]:
+def detener_grabacion_obs(
+    cliente_obs: obs.ReqClient,
+    estado: Optional[EstadoGrabacion] = None
+) -> Optional[Path]:
     """
     Detiene la grabación activa en OBS Studio.
     
     Args:
         cliente_obs: Cliente de OBS conectado.
+        estado: Estado local actualizado por eventos (opcional).
     
     Returns:
         Path: Ruta al archivo grabado si se obtuvo correctamente, None en caso contrario.
     """
     try:
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("VERIFICACIÓN: Verificando estado de grabación antes de detener...")
-        logging.info("=" * 70)
+        registrar_banner("VERIFICACIÓN: Verificando estado de grabación antes de detener...")
         
         ruta_original = None
         
         # Verificar si hay una grabación activa antes de intentar detenerla
         try:
-            estado_antes_detener = cliente_obs.get_record_status()
+            estado_antes_detener = obtener_estado_grabacion(cliente_obs, estado)
             
             if hasattr(estado_antes_detener, 'output_active') and estado_antes_detener.output_active:
                 logging.info("✓ Hay una grabación activa. Deteniéndola...")
                 
                 try:
                     info_grabacion = cliente_obs.stop_record()
-                    time.sleep(2)  # Esperar a que se detenga completamente
                     
                     # Verificar que la grabación se detuvo
-                    estado_despues = cliente_obs.get_record_status()
-                    if hasattr(estado_despues, 'output_active') and estado_despues.output_active:
+                    estado_despues = esperar_estado_grabacion(cliente_obs, activo=False, timeout=2.0, estado=estado)
+                    if getattr(estado_despues, 'output_active', False):
                         logging.warning("ADVERTENCIA: La grabación aún está activa. Forzando detención...")
                         cliente_obs.stop_record()
-                        time.sleep(2)
+                        esperar_estado_grabacion(cliente_obs, activo=False, timeout=2.0, estado=estado)
                     else:
                         logging.info("✓ Grabación detenida correctamente")
                     
@@ -148,7 +203,7 @@ def detener_grabacion_obs(cliente_obs: obs.ReqClient) -> Optional[Path]:
                         logging.warning("No se pudo obtener la ruta del archivo desde stop_record()")
                         # Intentar obtener desde el estado
                         try:
-                            estado_actual = cliente_obs.get_record_status()
+                            estado_actual = obtener_estado_grabacion(cliente_obs, estado)
                             if hasattr(estado_actual, 'output_path') and estado_actual.output_path:
                                 ruta_original = Path(estado_actual.output_path)
                                 logging.info(f"✓ Ruta obtenida desde estado: {ruta_original}")
@@ -177,54 +232,69 @@ def detener_grabacion_obs(cliente_obs: obs.ReqClient) -> Optional[Path]:
         # Si no se obtuvo la ruta, intentar una vez más
         if not ruta_original:
             try:
-                estado_final = cliente_obs.get_record_status()
+                estado_final = obtener_estado_grabacion(cliente_obs, estado)
                 if hasattr(estado_final, 'output_path') and estado_final.output_path:
                     ruta_original = Path(estado_final.output_path)
                     logging.info(f"✓ Ruta obtenida en verificación final: {ruta_original}")
             except:
                 pass
         
-        logging.info("=" * 70)
+        logging.info(SEPARADOR)
         
         return ruta_original
     
     except Exception as e:
         logging.error(f"ERROR al detener grabación: {e}")
-        import traceback
         logging.error(f"Traceback: {traceback.format_exc()}")
         return None
 
 
-def verificar_grabacion_activa(cliente_obs: obs.ReqClient) -> bool:
+def verificar_grabacion_activa(
+    cliente_obs: obs.ReqClient,
+    estado: Optional[EstadoGrabacion] = None
+) -> bool:
     """
     Verifica si hay una grabación activa en OBS.
     
     Args:
         cliente_obs: Cliente de OBS conectado.
+        estado: Estado local actualizado por eventos (opcional).
     
     Returns:
         bool: True si hay grabación activa, False en caso contrario.
     """
     try:
-        estado_grabacion = cliente_obs.get_record_status()
+        estado_grabacion = obtener_estado_grabacion(cliente_obs, estado)
         return hasattr(estado_grabacion, 'output_active') and estado_grabacion.output_active
     except:
         return False
 
 
-def asegurar_grabacion_detenida(cliente_obs: obs.ReqClient) -> None:
+def asegurar_grabacion_detenida(
+    cliente_obs: obs.ReqClient,
+    estado: Optional[EstadoGrabacion] = None,
+    espera_inactiva: float = 0.0
+) -> None:
     """
     Asegura que no haya ninguna grabación activa.
     
     Args:
         cliente_obs: Cliente de OBS conectado.
+        estado: Estado local actualizado por eventos (opcional).
+        espera_inactiva: Segundos que se da a OBS para terminar una detención en
+            curso antes de forzarla. Termina en cuanto la grabación está inactiva.
     """
     try:
-        estado_grabacion = cliente_obs.get_record_status()
+        if espera_inactiva > 0:
+            estado_grabacion = esperar_estado_grabacion(
+                cliente_obs, activo=False, timeout=espera_inactiva, estado=estado
+            )
+        else:
+            estado_grabacion = obtener_estado_grabacion(cliente_obs, estado)
         if hasattr(estado_grabacion, 'output_active') and estado_grabacion.output_active:
             logging.warning("Aún hay grabación activa. Forzando detención...")
             cliente_obs.stop_record()
-            time.sleep(2)
+            esperar_estado_grabacion(cliente_obs, activo=False, timeout=2.0, estado=estado)
     except:
         pass
 
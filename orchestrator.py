@@ -13,10 +13,11 @@ Es el punto de entrada principal del sistema.
 
 import time
 import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
-import config
-from utils import configurar_logging
+from typing import Dict, List, Mapping
+from utils import configurar_logging, registrar_banner, retener_logs_hilo, SEPARADOR_CORTO
 from url_processor import URLProcessor
 from browser_manager import BrowserManager
 from obs_manager import OBSManager
@@ -47,7 +48,8 @@ class Orchestrator:
             'videos_grabados': 0,
             'duracion_total_segundos': 0,
             'tamaño_total_bytes': 0,
-            'archivos_grabados': []
+            'archivos_grabados': [],
+            'archivos_no_guardados': []
         }
         self.file_manager = FileManager(self.estadisticas)
         self.video_processor = VideoProcessor(
@@ -80,12 +82,26 @@ class Orchestrator:
             if not carpetas_creadas:
                 return False
             
-            # 3. Conectar con OBS
-            if not self._conectar_obs():
+            # Mostrar instrucciones de configuración antes de conectar
+            mostrar_instrucciones_configuracion()
+            
+            # 3 y 4. Conectar con OBS e inicializar navegador en paralelo.
+            # Usan conexiones independientes (WebSocket de OBS y WebDriver); el
+            # driver solo se usa desde el hilo secundario hasta que termina.
+            # Los mensajes del navegador se retienen y se muestran después de
+            # los de OBS para que los dos pasos no se mezclen en el log.
+            with retener_logs_hilo("navegador"):
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="navegador") as executor:
+                    futuro_navegador = executor.submit(self._inicializar_navegador)
+                    obs_conectado = self._conectar_obs()
+                    navegador_inicializado = futuro_navegador.result()
+            
+            if not obs_conectado:
+                if navegador_inicializado:
+                    self.browser_manager.cerrar_navegador()
                 return False
             
-            # 4. Inicializar navegador
-            if not self._inicializar_navegador():
+            if not navegador_inicializado:
                 self.obs_manager.desconectar()
                 return False
             
@@ -94,7 +110,8 @@ class Orchestrator:
             try:
                 self._procesar_modulos(modulos, carpetas_creadas)
             finally:
-                # 6. Limpieza final y resumen
+                # 6. Limpieza final y resumen (con todos los archivos ya guardados)
+                self.file_manager.esperar_archivos_pendientes()
                 mostrar_resumen_final(self.estadisticas, modulos_procesados)
                 self._limpiar_recursos()
             
@@ -102,30 +119,23 @@ class Orchestrator:
         
         except KeyboardInterrupt:
             logging.warning("")
-            logging.warning("=" * 70)
-            logging.warning("INTERRUPCIÓN DEL USUARIO")
-            logging.warning("=" * 70)
+            registrar_banner("INTERRUPCIÓN DEL USUARIO", nivel=logging.WARNING)
             logging.warning("El proceso ha sido interrumpido por el usuario")
             self._limpiar_recursos()
             return False
         
         except Exception as e:
             logging.error("")
-            logging.error("=" * 70)
-            logging.error("ERROR CRÍTICO INESPERADO")
-            logging.error("=" * 70)
+            registrar_banner("ERROR CRÍTICO INESPERADO", nivel=logging.ERROR)
             logging.error(f"Error: {e}")
-            import traceback
             logging.error(f"Traceback: {traceback.format_exc()}")
             self._limpiar_recursos()
             return False
     
-    def _procesar_urls(self) -> Dict[str, List[str]]:
+    def _procesar_urls(self) -> Mapping[str, List[str]]:
         """Procesa el archivo de URLs y aplica filtros."""
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 1: PROCESANDO ARCHIVO DE URLs")
-        logging.info("=" * 70)
+        registrar_banner("PASO 1: PROCESANDO ARCHIVO DE URLs")
         
         modulos = self.url_processor.parsear_archivo_urls()
         if not modulos:
@@ -133,9 +143,7 @@ class Orchestrator:
             return {}
         
         # Aplicar filtros
-        self.url_processor.aplicar_modulo_inicio()
-        self.url_processor.aplicar_limites_prueba()
-        indices_inicio = self.url_processor.aplicar_inicio_video()
+        indices_inicio = self.url_processor.aplicar_todos_los_filtros()
         modulos = self.url_processor.obtener_todos_los_modulos()
         
         # Guardar índices de inicio para uso posterior
@@ -144,9 +152,12 @@ class Orchestrator:
         # Mostrar resumen
         total_videos = sum(len(urls) for urls in modulos.values())
         logging.info("")
-        logging.info("=" * 60)
-        logging.info(f"RESUMEN: Se procesarán {len(modulos)} módulo(s) con {total_videos} video(s) en total")
-        logging.info("=" * 60)
+        registrar_banner(
+            "RESUMEN: Se procesarán %d módulo(s) con %d video(s) en total",
+            len(modulos),
+            total_videos,
+            separador=SEPARADOR_CORTO
+        )
         logging.info("")
         
         return modulos
@@ -154,9 +165,7 @@ class Orchestrator:
     def _crear_estructura_carpetas(self) -> Dict[str, Path]:
         """Crea la estructura de carpetas para los módulos."""
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 2: CREANDO ESTRUCTURA DE CARPETAS")
-        logging.info("=" * 70)
+        registrar_banner("PASO 2: CREANDO ESTRUCTURA DE CARPETAS")
         
         directorio_base = Path.cwd()
         carpetas_creadas = self.url_processor.crear_estructura_carpetas(directorio_base)
@@ -169,9 +178,7 @@ class Orchestrator:
     def _conectar_obs(self) -> bool:
         """Conecta con OBS Studio."""
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 3: CONECTANDO CON OBS STUDIO")
-        logging.info("=" * 70)
+        registrar_banner("PASO 3: CONECTANDO CON OBS STUDIO")
         
         if not self.obs_manager.conectar():
             logging.error("ERROR CRÍTICO: No se pudo conectar con OBS Studio")
@@ -180,17 +187,12 @@ class Orchestrator:
         # Mostrar información de escenas
         self.obs_manager.mostrar_informacion_escenas()
         
-        # Mostrar instrucciones de configuración
-        mostrar_instrucciones_configuracion()
-        
         return True
     
     def _inicializar_navegador(self) -> bool:
         """Inicializa el navegador."""
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 4: INICIALIZANDO NAVEGADOR")
-        logging.info("=" * 70)
+        registrar_banner("PASO 4: INICIALIZANDO NAVEGADOR")
         
         if not self.browser_manager.inicializar_navegador():
             logging.error("ERROR CRÍTICO: No se pudo inicializar el navegador")
@@ -202,7 +204,7 @@ class Orchestrator:
     
     def _procesar_modulos(
         self,
-        modulos: Dict[str, List[str]],
+        modulos: Mapping[str, List[str]],
         carpetas: Dict[str, Path]
     ) -> None:
         """
@@ -213,16 +215,12 @@ class Orchestrator:
             carpetas: Diccionario con módulos y sus rutas de carpetas.
         """
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 5: PROCESANDO VIDEOS")
-        logging.info("=" * 70)
+        registrar_banner("PASO 5: PROCESANDO VIDEOS")
         
         for nombre_modulo, urls in modulos.items():
             try:
                 logging.info("")
-                logging.info("=" * 70)
-                logging.info(f"VERIFICACIÓN: Procesando Módulo: {nombre_modulo}")
-                logging.info("=" * 70)
+                registrar_banner(f"VERIFICACIÓN: Procesando Módulo: {nombre_modulo}")
                 
                 ruta_modulo = carpetas.get(nombre_modulo)
                 if not ruta_modulo:
@@ -240,7 +238,6 @@ class Orchestrator:
             
             except Exception as e:
                 logging.error(f"ERROR al procesar módulo '{nombre_modulo}': {e}")
-                import traceback
                 logging.error(f"Traceback: {traceback.format_exc()}")
                 continue
     
@@ -249,10 +246,6 @@ class Orchestrator:
         # Asegurar que no hay grabación activa
         self.obs_manager.asegurar_grabacion_detenida()
         
-        # Esperar tiempo adicional antes de cambiar el directorio
-        logging.info("Esperando para asegurar que el archivo del módulo anterior se haya guardado completamente...")
-        time.sleep(2)
-        
         # Configurar directorio de grabación en OBS
         if not self.obs_manager.configurar_directorio_grabacion(ruta_modulo):
             logging.error(f"ERROR CRÍTICO: No se pudo configurar directorio en OBS para '{nombre_modulo}'")
@@ -274,24 +267,23 @@ class Orchestrator:
             nombre_modulo: Nombre del módulo.
             indice_inicio: Índice desde el cual empezar la numeración de archivos.
         """
+        # Valores invariantes del bucle
+        total_videos = len(urls)
+        procesar_video = self.video_processor.procesar_video
+        
         for i, url in enumerate(urls, 1):
             # Calcular el número real del video para el nombre del archivo
             numero_video = indice_inicio + i - 1
             
             # Procesar video usando VideoProcessor
-            self.video_processor.procesar_video(
+            procesar_video(
                 url=url,
                 ruta_modulo=ruta_modulo,
                 nombre_modulo=nombre_modulo,
                 numero_video=numero_video,
                 indice_lista=i,
-                total_videos=len(urls)
+                total_videos=total_videos
             )
-            
-            # Si es el último video del módulo, esperar adicional
-            if i == len(urls):
-                logging.info("Esperando tiempo adicional para asegurar que el archivo se haya guardado completamente...")
-                time.sleep(3)
     
     def _limpiar_recursos(self) -> None:
         """Limpia todos los recursos utilizados (navegador, OBS, etc.)."""
@@ -303,6 +295,12 @@ class Orchestrator:
         except:
             pass
         
+        # Terminar de guardar los archivos pendientes
+        try:
+            self.file_manager.cerrar()
+        except:
+            pass
+        
         # Desconectar de OBS
         try:
             self.obs_manager.desconectar()
@@ -329,15 +327,11 @@ def main():
     
     if success:
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("PROCESO COMPLETADO EXITOSAMENTE")
-        logging.info("=" * 70)
+        registrar_banner("PROCESO COMPLETADO EXITOSAMENTE")
         logging.info("")
     else:
         logging.error("")
-        logging.error("=" * 70)
-        logging.error("PROCESO FINALIZADO CON ERRORES")
-        logging.error("=" * 70)
+        registrar_banner("PROCESO FINALIZADO CON ERRORES", nivel=logging.ERROR)
         logging.error("")
     
     return 0 if success else 1
@@ -7,10 +7,33 @@ Este módulo se encarga de:
 - Formatear información de resultados
 """
 
+import os
 import logging
 from pathlib import Path
 from typing import Dict, List
-from utils import formatear_tiempo, formatear_tamaño
+from utils import formatear_tiempo, formatear_tamaño, registrar_banner, SEPARADOR
+
+
+def _tamaño_directorio(ruta: Path) -> int:
+    """
+    Suma el tamaño de los archivos de un directorio (sin recorrer subdirectorios).
+    
+    Args:
+        ruta: Directorio a medir.
+    
+    Returns:
+        int: Tamaño en bytes, o 0 si el directorio no existe.
+    """
+    try:
+        # os.scandir reutiliza el tipo y el tamaño obtenidos al listar el directorio
+        with os.scandir(ruta) as entradas:
+            return sum(
+                entrada.stat(follow_symlinks=False).st_size
+                for entrada in entradas
+                if entrada.is_file(follow_symlinks=False)
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
 
 
 def calcular_tamaño_total(modulos_procesados: List[str]) -> int:
@@ -24,19 +47,12 @@ def calcular_tamaño_total(modulos_procesados: List[str]) -> int:
         int: Tamaño total en bytes.
     """
     directorio_base = Path.cwd()
-    tamaño_total = 0
     
     try:
-        for nombre_modulo in modulos_procesados:
-            ruta_modulo = directorio_base / nombre_modulo
-            if ruta_modulo.exists() and ruta_modulo.is_dir():
-                for archivo in ruta_modulo.iterdir():
-                    if archivo.is_file():
-                        tamaño_total += archivo.stat().st_size
+        return sum(_tamaño_directorio(directorio_base / nombre_modulo) for nombre_modulo in modulos_procesados)
     except Exception as e:
         logging.warning(f"Error al calcular tamaño total: {e}")
-    
-    return tamaño_total
+        return 0
 
 
 def mostrar_resumen_final(estadisticas: Dict, modulos_procesados: List[str]) -> None:
@@ -48,9 +64,7 @@ def mostrar_resumen_final(estadisticas: Dict, modulos_procesados: List[str]) ->
         modulos_procesados: Lista de nombres de módulos procesados.
     """
     logging.info("")
-    logging.info("=" * 70)
-    logging.info("RESUMEN FINAL DE EJECUCIÓN")
-    logging.info("=" * 70)
+    registrar_banner("RESUMEN FINAL DE EJECUCIÓN")
     
     # Calcular tamaño total de archivos
     tamaño_total_calculado = calcular_tamaño_total(modulos_procesados)
@@ -77,6 +91,12 @@ def mostrar_resumen_final(estadisticas: Dict, modulos_procesados: List[str]) ->
     else:
         logging.info(f"  ✓ Tamaño total de archivos: 0 bytes")
     
-    logging.info("=" * 70)
+    archivos_no_guardados = estadisticas.get('archivos_no_guardados', [])
+    if archivos_no_guardados:
+        logging.warning(f"  ✗ Archivos que no se pudieron guardar: {len(archivos_no_guardados)}")
+        for etiqueta in archivos_no_guardados:
+            logging.warning(f"    - {etiqueta}")
+    
+    logging.info(SEPARADOR)
     logging.info("")
 
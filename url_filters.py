@@ -8,125 +8,93 @@ Este módulo se encarga de:
 """
 
 import logging
-from typing import Dict, List
-import config
+from typing import Dict, List, Tuple
 
 
-def aplicar_modulo_inicio(modulos: Dict[str, List[str]]) -> Dict[str, List[str]]:
+def aplicar_filtros(modulos: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
     """
-    Filtra los módulos para empezar desde un módulo específico.
+    Aplica todos los filtros en una sola pasada sobre los módulos.
+    
+    En este orden: empieza desde MODULO_INICIO, aplica los límites del modo
+    de prueba y recorta cada módulo según el inicio de video configurado
+    (INICIO_VIDEO_POR_MODULO, o INICIO_VIDEO solo para el primer módulo).
     
     Args:
-        modulos: Diccionario de módulos y URLs.
+        modulos: Diccionario de módulos y URLs (las listas de URLs se recortan in-place).
     
     Returns:
-        Dict: Diccionario filtrado de módulos.
+        Tuple: (diccionario filtrado de módulos, índices de inicio por módulo).
     """
-    if not config.MODULO_INICIO:
-        return modulos
+    # Importación diferida: config solo se carga cuando se aplican los filtros
+    import config
     
-    modulos_lista = list(modulos.items())
-    modulo_encontrado = False
-    modulos_filtrados = {}
+    modulo_inicio = config.MODULO_INICIO
+    if modulo_inicio and modulo_inicio not in modulos:
+        logging.warning(f"ADVERTENCIA: No se encontró el módulo '{modulo_inicio}'. Se procesarán todos los módulos.")
+        modulo_inicio = None
     
-    for nombre_modulo, urls in modulos_lista:
-        if nombre_modulo == config.MODULO_INICIO:
-            modulo_encontrado = True
-            modulos_filtrados[nombre_modulo] = urls
-            logging.info(f"Empezando desde el módulo '{nombre_modulo}'")
-        elif modulo_encontrado:
-            modulos_filtrados[nombre_modulo] = urls
+    max_modulos = config.MAX_MODULOS_PRUEBA if config.MODO_PRUEBA else None
+    max_videos = config.MAX_VIDEOS_POR_MODULO_PRUEBA if config.MODO_PRUEBA else None
     
-    if not modulo_encontrado:
-        logging.warning(f"ADVERTENCIA: No se encontró el módulo '{config.MODULO_INICIO}'. Se procesarán todos los módulos.")
-        return modulos
+    inicio_por_modulo = config.INICIO_VIDEO_POR_MODULO
+    if not (inicio_por_modulo and isinstance(inicio_por_modulo, dict)):
+        inicio_por_modulo = None
+    inicio_global = config.INICIO_VIDEO
+    
+    modulos_filtrados = {}
+    indices_inicio = {}
+    modulos_omitidos = 0
+    
+    for nombre_modulo, urls in modulos.items():
+        # Saltar los módulos anteriores al módulo de inicio
+        if modulo_inicio:
+            if nombre_modulo != modulo_inicio:
+                modulos_omitidos += 1
+                continue
+            logging.info(f"Empezando desde el módulo '{nombre_modulo}'")
+            modulo_inicio = None
+        
+        if max_modulos and len(modulos_filtrados) == max_modulos:
+            break
+        
+        if max_videos and len(urls) > max_videos:
+            logging.info(f"Modo prueba: Limitando '{nombre_modulo}' a {max_videos} de {len(urls)} videos")
+            del urls[max_videos:]
+        
+        modulos_filtrados[nombre_modulo] = urls
+        indices_inicio[nombre_modulo] = 1
+        
+        # El inicio global solo se aplica al primer módulo
+        if inicio_por_modulo is not None:
+            inicio = inicio_por_modulo.get(nombre_modulo)
+        else:
+            inicio = inicio_global if len(modulos_filtrados) == 1 else None
+        if inicio is not None and inicio > 1:
+            _aplicar_inicio_modulo(nombre_modulo, urls, inicio, indices_inicio)
     
-    modulos_omitidos = len(modulos) - len(modulos_filtrados)
     if modulos_omitidos > 0:
         logging.info(f"Omitiendo {modulos_omitidos} módulo(s) anteriores a '{config.MODULO_INICIO}'")
     
-    return modulos_filtrados
-
-
-def aplicar_limites_prueba(modulos: Dict[str, List[str]]) -> Dict[str, List[str]]:
-    """
-    Aplica los límites configurados para el modo de prueba.
+    modulos_disponibles = len(modulos) - modulos_omitidos
+    if len(modulos_filtrados) < modulos_disponibles:
+        logging.info(f"Modo prueba: Procesando solo {len(modulos_filtrados)} de {modulos_disponibles} módulos")
     
-    Args:
-        modulos: Diccionario de módulos y URLs.
-    
-    Returns:
-        Dict: Diccionario con límites aplicados.
-    """
-    if not config.MODO_PRUEBA:
-        return modulos
-    
-    modulos_limitados = modulos.copy()
-    
-    if config.MAX_MODULOS_PRUEBA:
-        modulos_lista = list(modulos_limitados.items())
-        modulos_limitados = dict(modulos_lista[:config.MAX_MODULOS_PRUEBA])
-        modulos_omitidos = len(modulos) - len(modulos_limitados)
-        
-        if modulos_omitidos > 0:
-            logging.info(f"Modo prueba: Procesando solo {len(modulos_limitados)} de {len(modulos)} módulos")
-    
-    if config.MAX_VIDEOS_POR_MODULO_PRUEBA:
-        for modulo, urls in modulos_limitados.items():
-            if len(urls) > config.MAX_VIDEOS_POR_MODULO_PRUEBA:
-                urls_limitadas = urls[:config.MAX_VIDEOS_POR_MODULO_PRUEBA]
-                logging.info(f"Modo prueba: Limitando '{modulo}' a {len(urls_limitadas)} de {len(urls)} videos")
-                modulos_limitados[modulo] = urls_limitadas
-    
-    return modulos_limitados
+    return modulos_filtrados, indices_inicio
 
 
-def aplicar_inicio_video(modulos: Dict[str, List[str]]) -> Dict[str, int]:
+def _aplicar_inicio_modulo(modulo: str, urls: List[str], inicio: int, indices_inicio: Dict[str, int]) -> None:
     """
-    Aplica la configuración de inicio de video para continuar desde un índice específico.
+    Recorta in-place las URLs de un módulo para empezar desde el video indicado.
     
     Args:
-        modulos: Diccionario de módulos y URLs (se modifica in-place).
-    
-    Returns:
-        Dict: Diccionario con índices de inicio por módulo.
+        modulo: Nombre del módulo.
+        urls: Lista de URLs del módulo (se modifica in-place).
+        inicio: Número del video desde el que empezar (1 = primero).
+        indices_inicio: Diccionario de índices de inicio a actualizar.
     """
-    indices_inicio = {}
-    
-    # Si hay configuración por módulo, usarla
-    if config.INICIO_VIDEO_POR_MODULO and isinstance(config.INICIO_VIDEO_POR_MODULO, dict):
-        for modulo, urls in modulos.items():
-            inicio = config.INICIO_VIDEO_POR_MODULO.get(modulo)
-            if inicio is not None and inicio > 1:
-                if inicio <= len(urls):
-                    modulos[modulo] = urls[inicio - 1:]
-                    indices_inicio[modulo] = inicio
-                    logging.info(f"Continuando '{modulo}' desde el video {inicio} (quedan {len(modulos[modulo])} videos)")
-                else:
-                    logging.warning(f"ADVERTENCIA: Índice de inicio {inicio} mayor que el número de videos ({len(urls)}) en '{modulo}'. Se procesarán todos los videos.")
-                    indices_inicio[modulo] = 1
-            else:
-                indices_inicio[modulo] = 1
-    # Si hay configuración global, aplicarla solo al primer módulo
-    elif config.INICIO_VIDEO and config.INICIO_VIDEO > 1:
-        primer_modulo = True
-        for modulo, urls in modulos.items():
-            if primer_modulo:
-                inicio = config.INICIO_VIDEO
-                if inicio <= len(urls):
-                    modulos[modulo] = urls[inicio - 1:]
-                    indices_inicio[modulo] = inicio
-                    logging.info(f"Continuando '{modulo}' desde el video {inicio} (quedan {len(modulos[modulo])} videos)")
-                else:
-                    logging.warning(f"ADVERTENCIA: Índice de inicio {inicio} mayor que el número de videos ({len(urls)}) en '{modulo}'. Se procesarán todos los videos.")
-                    indices_inicio[modulo] = 1
-                primer_modulo = False
-            else:
-                indices_inicio[modulo] = 1
+    if inicio <= len(urls):
+        del urls[:inicio - 1]
+        indices_inicio[modulo] = inicio
+        logging.info(f"Continuando '{modulo}' desde el video {inicio} (quedan {len(urls)} videos)")
     else:
-        # Sin configuración de inicio, todos empiezan desde 1
-        for modulo in modulos.keys():
-            indices_inicio[modulo] = 1
-    
-    return indices_inicio
-
+        logging.warning(f"ADVERTENCIA: Índice de inicio {inicio} mayor que el número de videos ({len(urls)}) en '{modulo}'. Se procesarán todos los videos.")
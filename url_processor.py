@@ -8,12 +8,15 @@ Este módulo se encarga de:
 - Organizar los datos en una estructura de datos útil
 """
 
+import os
 import logging
+import traceback
 from pathlib import Path
-from typing import Dict, List, Optional
-import config
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+from utils import SEPARADOR, registrar_banner
 from url_validator import validar_url_youtube
-from url_filters import aplicar_modulo_inicio, aplicar_limites_prueba, aplicar_inicio_video
+from url_filters import aplicar_filtros
 
 
 class URLProcessor:
@@ -24,6 +27,8 @@ class URLProcessor:
     de URLs desde el archivo de texto.
     """
     
+    __slots__ = ('url_file', 'modulos')
+    
     def __init__(self, url_file: str = None):
         """
         Inicializa el procesador de URLs.
@@ -31,7 +36,11 @@ class URLProcessor:
         Args:
             url_file: Ruta al archivo de texto con las URLs. Si es None, usa el valor de config.
         """
-        self.url_file = url_file or config.URL_FILE
+        if not url_file:
+            # Importación diferida: config solo se carga si no se indica el archivo
+            import config
+            url_file = config.URL_FILE
+        self.url_file = url_file
         self.modulos: Dict[str, List[str]] = {}
     
     def parsear_archivo_urls(self) -> Optional[Dict[str, List[str]]]:
@@ -41,66 +50,82 @@ class URLProcessor:
         Returns:
             Dict con el formato {nombre_modulo: [lista_de_urls]}, o None si hay error.
         """
-        logging.info("=" * 70)
-        logging.info("VERIFICACIÓN: Leyendo archivo de URLs...")
-        logging.info("=" * 70)
+        registrar_banner("VERIFICACIÓN: Leyendo archivo de URLs...")
         
-        filepath = Path(self.url_file)
+        filepath = self.url_file
         
         # Verificar que el archivo existe
-        if not filepath.exists():
+        if not os.path.exists(filepath):
             logging.error(f"ERROR CRÍTICO: El archivo '{self.url_file}' no se encuentra en este directorio.")
-            logging.error(f"Ruta esperada: {filepath.resolve()}")
+            logging.error(f"Ruta esperada: {os.path.abspath(filepath)}")
             return None
         
-        logging.info(f"✓ Archivo encontrado: {filepath.resolve()}")
+        logging.info(f"✓ Archivo encontrado: {os.path.abspath(filepath)}")
         
         modulos = {}
         modulo_actual = None
+        agregar_url = None
+        validar = validar_url_youtube
         lineas_procesadas = 0
         modulos_encontrados = 0
         urls_encontradas = 0
+        # Las URLs inválidas se notifican en un único aviso al terminar la lectura
+        urls_invalidas: List[str] = []
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for num_linea, linea in enumerate(f, 1):
-                    linea = linea.strip()
-                    
-                    # Ignorar líneas vacías
-                    if not linea:
-                        continue
-                    
-                    lineas_procesadas += 1
-                    
-                    # Detectar inicio de módulo (línea que empieza con #)
-                    if linea.startswith('#'):
-                        modulo_actual = linea.lstrip('# ').strip()
-                        if modulo_actual:
-                            modulos[modulo_actual] = []
-                            modulos_encontrados += 1
-                            logging.info(f"✓ Módulo encontrado (línea {num_linea}): '{modulo_actual}'")
-                        else:
-                            logging.warning(f"ADVERTENCIA: Línea {num_linea} tiene '#' pero está vacía")
-                    
-                    # Detectar URL (línea que empieza con http)
-                    elif modulo_actual and linea.startswith('http'):
-                        if validar_url_youtube(linea):
-                            modulos[modulo_actual].append(linea)
-                            urls_encontradas += 1
-                        else:
-                            logging.warning(f"ADVERTENCIA: URL inválida en línea {num_linea}: {linea[:50]}...")
-                    
-                    # Línea que no es módulo ni URL válida
-                    elif modulo_actual:
-                        logging.warning(f"ADVERTENCIA: Línea {num_linea} ignorada (no es URL válida): {linea[:50]}")
+            # El archivo es pequeño: se lee de una vez y se divide en líneas en C.
+            # utf-8-sig descarta el BOM que añaden algunos editores en Windows.
+            with open(filepath, 'r', encoding='utf-8-sig') as f:
+                contenido = f.read()
+            
+            for num_linea, linea in enumerate(contenido.splitlines(), 1):
+                linea = linea.strip()
+                
+                # Ignorar líneas vacías
+                if not linea:
+                    continue
+                
+                lineas_procesadas += 1
+                primer_caracter = linea[0]
+                
+                # Detectar inicio de módulo (línea que empieza con #)
+                if primer_caracter == '#':
+                    modulo_actual = linea.lstrip('# ').strip()
+                    if modulo_actual:
+                        # Método append de la lista del módulo en una variable local: cada URL
+                        # se agrega sin indexar el diccionario ni buscar el atributo
+                        urls_modulo = modulos[modulo_actual] = []
+                        agregar_url = urls_modulo.append
+                        modulos_encontrados += 1
+                        logging.info("✓ Módulo encontrado (línea %d): '%s'", num_linea, modulo_actual)
+                    else:
+                        logging.warning("ADVERTENCIA: Línea %d tiene '#' pero está vacía", num_linea)
+                
+                # Detectar URL (línea que empieza con http)
+                elif modulo_actual and primer_caracter == 'h' and linea.startswith('http'):
+                    if validar(linea):
+                        agregar_url(linea)
+                        urls_encontradas += 1
+                    else:
+                        urls_invalidas.append(f"  - Línea {num_linea}: {linea[:50]}...")
+                
+                # Línea que no es módulo ni URL válida
+                elif modulo_actual:
+                    logging.warning("ADVERTENCIA: Línea %d ignorada (no es URL válida): %s", num_linea, linea[:50])
+            
+            if urls_invalidas:
+                logging.warning(
+                    "ADVERTENCIA: %d URL(s) inválida(s):\n%s",
+                    len(urls_invalidas), "\n".join(urls_invalidas)
+                )
             
             # Mostrar resumen de la lectura
-            logging.info("=" * 70)
-            logging.info(f"RESUMEN DE LECTURA:")
-            logging.info(f"  - Líneas procesadas: {lineas_procesadas}")
-            logging.info(f"  - Módulos encontrados: {modulos_encontrados}")
-            logging.info(f"  - URLs encontradas: {urls_encontradas}")
-            logging.info("=" * 70)
+            logging.info(SEPARADOR)
+            logging.info("RESUMEN DE LECTURA:")
+            logging.info("  - Líneas procesadas: %d", lineas_procesadas)
+            logging.info("  - Módulos encontrados: %d", modulos_encontrados)
+            logging.info("  - URLs encontradas: %d", urls_encontradas)
+            logging.info(SEPARADOR)
             
             # Validar que se encontraron módulos
             if not modulos:
@@ -123,7 +148,6 @@ class URLProcessor:
             return None
         except Exception as e:
             logging.error(f"ERROR CRÍTICO inesperado al leer archivo: {e}")
-            import traceback
             logging.error(f"Traceback: {traceback.format_exc()}")
             return None
     
@@ -145,11 +169,17 @@ class URLProcessor:
             directorio_base = Path.cwd()
         
         logging.info("")
-        logging.info("=" * 70)
-        logging.info("VERIFICACIÓN: Creando estructura de carpetas...")
-        logging.info("=" * 70)
+        registrar_banner("VERIFICACIÓN: Creando estructura de carpetas...")
         
         carpetas_creadas = {}
+        base = os.fspath(directorio_base)
+        
+        # Una sola lectura del directorio base para saber qué carpetas ya existen
+        try:
+            with os.scandir(base) as entradas:
+                carpetas_existentes = {entrada.name for entrada in entradas if entrada.is_dir()}
+        except OSError:
+            carpetas_existentes = set()
         
         try:
             for nombre_modulo, urls in self.modulos.items():
@@ -157,18 +187,17 @@ class URLProcessor:
                     logging.warning(f"Saltando módulo '{nombre_modulo}' sin URLs")
                     continue
                 
-                ruta_modulo = directorio_base / nombre_modulo
+                ruta_modulo = os.path.join(base, nombre_modulo)
                 
                 # Crear carpeta si no existe
                 try:
-                    if ruta_modulo.exists():
+                    if nombre_modulo in carpetas_existentes:
                         logging.info(f"ADVERTENCIA: La carpeta '{nombre_modulo}' ya existe. Se sobreescribirán archivos.")
                     else:
                         logging.info(f"Creando carpeta: {nombre_modulo}")
-                    
-                    ruta_modulo.mkdir(exist_ok=True)
-                    carpetas_creadas[nombre_modulo] = ruta_modulo
-                    logging.info(f"✓ Carpeta lista: {ruta_modulo.resolve()}")
+                        os.makedirs(ruta_modulo, exist_ok=True)
+                    carpetas_creadas[nombre_modulo] = Path(ruta_modulo)
+                    logging.info(f"✓ Carpeta lista: {ruta_modulo}")
                 
                 except PermissionError as e:
                     logging.error(f"ERROR: Sin permisos para crear carpeta '{nombre_modulo}': {e}")
@@ -177,15 +206,12 @@ class URLProcessor:
                     logging.error(f"ERROR al crear carpeta '{nombre_modulo}': {e}")
                     continue
             
-            logging.info("=" * 70)
-            logging.info(f"✓ Estructura de carpetas creada: {len(carpetas_creadas)} módulo(s)")
-            logging.info("=" * 70)
+            registrar_banner(f"✓ Estructura de carpetas creada: {len(carpetas_creadas)} módulo(s)")
             
             return carpetas_creadas
         
         except Exception as e:
             logging.error(f"ERROR CRÍTICO inesperado al crear carpetas: {e}")
-            import traceback
             logging.error(f"Traceback: {traceback.format_exc()}")
             return carpetas_creadas
     
@@ -201,28 +227,24 @@ class URLProcessor:
         """
         return self.modulos.get(nombre_modulo, [])
     
-    def obtener_todos_los_modulos(self) -> Dict[str, List[str]]:
+    def obtener_todos_los_modulos(self) -> Mapping[str, List[str]]:
         """
         Obtiene todos los módulos y sus URLs.
         
+        Devuelve una vista de solo lectura en lugar de una copia; quien necesite
+        modificarla debe copiarla con dict().
+        
         Returns:
-            Dict con todos los módulos y sus URLs.
+            Vista de solo lectura con todos los módulos y sus URLs.
         """
-        return self.modulos.copy()
-    
-    def aplicar_modulo_inicio(self) -> None:
-        """Filtra los módulos para empezar desde un módulo específico."""
-        self.modulos = aplicar_modulo_inicio(self.modulos)
-    
-    def aplicar_limites_prueba(self) -> None:
-        """Aplica los límites configurados para el modo de prueba."""
-        self.modulos = aplicar_limites_prueba(self.modulos)
+        return MappingProxyType(self.modulos)
     
-    def aplicar_inicio_video(self) -> Dict[str, int]:
+    def aplicar_todos_los_filtros(self) -> Dict[str, int]:
         """
-        Aplica la configuración de inicio de video para continuar desde un índice específico.
+        Aplica el módulo de inicio, los límites de prueba y el inicio de video en una sola pasada.
         
         Returns:
             Dict con el formato {nombre_modulo: indice_inicio} para usar en la numeración de archivos.
         """
-        return aplicar_inicio_video(self.modulos)
+        self.modulos, indices_inicio = aplicar_filtros(self.modulos)
+        return indices_inicio
@@ -6,6 +6,16 @@ Este módulo se encarga de:
 - Verificar formato de URLs
 """
 
+import re
+from functools import lru_cache
+
+
+# Esquema http(s) seguido de un dominio de YouTube (con subdominios opcionales)
+PATRON_URL_YOUTUBE = re.compile(
+    r'^https?://(?:[\w-]+\.)*(?:youtube\.com|youtu\.be)(?:[/:?#]|$)',
+    re.IGNORECASE
+)
+
 
 def validar_url_youtube(url: str) -> bool:
     """
@@ -20,7 +30,22 @@ def validar_url_youtube(url: str) -> bool:
     if not url or not isinstance(url, str):
         return False
     
-    # Verificar que sea una URL de YouTube
-    youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com']
-    return any(domain in url.lower() for domain in youtube_domains)
+    return _es_url_youtube(url)
 
+
+@lru_cache(maxsize=4096)
+def _es_url_youtube(url: str) -> bool:
+    """
+    Comprueba el patrón de YouTube, memorizando el resultado por URL.
+    
+    Las URLs repetidas en el archivo (por ejemplo, en varios módulos) no se
+    vuelven a evaluar. Solo recibe cadenas no vacías, ya filtradas por
+    validar_url_youtube.
+    
+    Args:
+        url: La URL a comprobar.
+    
+    Returns:
+        bool: True si la URL es de YouTube, False en caso contrario.
+    """
+    return PATRON_URL_YOUTUBE.match(url) is not None
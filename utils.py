@@ -6,7 +6,21 @@ Contiene funciones auxiliares utilizadas por múltiples módulos del sistema.
 
 import re
 import logging
-from pathlib import Path
+from contextlib import contextmanager
+
+
+# Línea separadora usada en los encabezados de los logs
+SEPARADOR = "=" * 70
+# Separador más corto del resumen de URLs y del aviso de modo de prueba
+SEPARADOR_CORTO = "=" * 60
+
+# Patrón de sanitizar_nombre_archivo, compilado una sola vez al importar
+_SANITIZAR_ESPACIOS = re.compile(r'[\s|:]+')
+# Tabla para eliminar en una sola pasada los caracteres no válidos
+_SANITIZAR_INVALIDOS = str.maketrans("", "", '\\/*?"<>|')
+
+# Divisores y unidades de formatear_tamaño, indexados por potencia de 1024
+_UNIDADES_TAMAÑO = ((1, "B"), (1 << 10, "KB"), (1 << 20, "MB"), (1 << 30, "GB"), (1 << 40, "TB"))
 
 
 def sanitizar_nombre_archivo(nombre: str) -> str:
@@ -26,16 +40,17 @@ def sanitizar_nombre_archivo(nombre: str) -> str:
         >>> sanitizar_nombre_archivo("Video: Test | Parte 1/2")
         'Video_Test_Parte_1_2'
     """
-    try:
-        # Reemplazar espacios, | y : con _
-        nombre = re.sub(r'[\s|:]+', '_', nombre)
-        # Eliminar caracteres no válidos para nombres de archivo
-        nombre = re.sub(r'[\\/*?"<>|]', "", nombre)
-        # Limitar la longitud
-        return nombre[:150]
-    except Exception as e:
-        logging.error(f"Error al sanitizar nombre de archivo '{nombre}': {e}")
+    # La única entrada que puede fallar es un valor que no es texto
+    if not isinstance(nombre, str):
+        logging.error(f"Error al sanitizar nombre de archivo '{nombre}': no es un texto")
         return "video_sin_nombre"
+    
+    # Reemplazar espacios, | y : con _
+    nombre = _SANITIZAR_ESPACIOS.sub('_', nombre)
+    # Eliminar caracteres no válidos para nombres de archivo
+    nombre = nombre.translate(_SANITIZAR_INVALIDOS)
+    # Limitar la longitud
+    return nombre[:150]
 
 
 def parsear_duracion_a_segundos(duration_str: str) -> int:
@@ -61,23 +76,22 @@ def parsear_duracion_a_segundos(duration_str: str) -> int:
         >>> parsear_duracion_a_segundos("45")
         45
     """
-    if not duration_str or not duration_str.strip():
+    if not duration_str:
+        return 0
+    
+    duracion = duration_str.strip()
+    if not duracion:
         return 0
     
+    # Como máximo tres campos; un campo de más queda en el primero y no es un entero
+    partes = duracion.rsplit(':', 2)
     try:
-        # Limpiar el string y dividir por ':'
-        partes_str = duration_str.strip().split(':')
-        # Filtrar partes vacías y convertir a int
-        partes = [int(p) for p in partes_str if p.strip()]
-        
         if len(partes) == 3:  # HH:MM:SS
-            return partes[0] * 3600 + partes[1] * 60 + partes[2]
+            return int(partes[0]) * 3600 + int(partes[1]) * 60 + int(partes[2])
         if len(partes) == 2:  # MM:SS
-            return partes[0] * 60 + partes[1]
-        if len(partes) == 1:  # SS
-            return partes[0]
-        return 0
-    except (ValueError, IndexError) as e:
+            return int(partes[0]) * 60 + int(partes[1])
+        return int(partes[0])  # SS
+    except ValueError as e:
         logging.warning(f"Error al parsear duración '{duration_str}': {e}")
         return 0
 
@@ -99,24 +113,21 @@ def formatear_tiempo(segundos: int) -> str:
     if segundos < 60:
         return f"{segundos} segundo(s)"
     
-    minutos = segundos // 60
-    segundos_restantes = segundos % 60
+    minutos, segundos_restantes = divmod(segundos, 60)
     
     if minutos < 60:
         if segundos_restantes > 0:
             return f"{minutos} minuto(s) y {segundos_restantes} segundo(s)"
         return f"{minutos} minuto(s)"
     
-    horas = minutos // 60
-    minutos_restantes = minutos % 60
+    horas, minutos_restantes = divmod(minutos, 60)
     
     if horas < 24:
         if minutos_restantes > 0:
             return f"{horas} hora(s) y {minutos_restantes} minuto(s)"
         return f"{horas} hora(s)"
     
-    dias = horas // 24
-    horas_restantes = horas % 24
+    dias, horas_restantes = divmod(horas, 24)
     
     if horas_restantes > 0:
         return f"{dias} día(s) y {horas_restantes} hora(s)"
@@ -140,20 +151,9 @@ def formatear_tamaño(bytes_size: int) -> str:
     if bytes_size < 1024:
         return f"{bytes_size} B"
     
-    kb = bytes_size / 1024
-    if kb < 1024:
-        return f"{kb:.2f} KB"
-    
-    mb = kb / 1024
-    if mb < 1024:
-        return f"{mb:.2f} MB"
-    
-    gb = mb / 1024
-    if gb < 1024:
-        return f"{gb:.2f} GB"
-    
-    tb = gb / 1024
-    return f"{tb:.2f} TB"
+    # Cada unidad abarca 10 bits: el número de bits indica la unidad directamente
+    divisor, unidad = _UNIDADES_TAMAÑO[min((bytes_size.bit_length() - 1) // 10, 4)]
+    return f"{bytes_size / divisor:.2f} {unidad}"
 
 
 def configurar_logging():
@@ -167,3 +167,78 @@ def configurar_logging():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
+
+def registrar_banner(
+    titulo: str,
+    *args,
+    nivel: int = logging.INFO,
+    linea_en_blanco: bool = False,
+    separador: str = SEPARADOR
+) -> None:
+    """
+    Registra un encabezado enmarcado entre separadores en un único mensaje.
+    
+    Emitir el encabezado como un solo registro evita formatear y escribir
+    tres registros distintos. Si el nivel está deshabilitado no se construye
+    el mensaje, y los argumentos solo se formatean si el mensaje se escribe.
+    
+    Args:
+        titulo: Texto del encabezado; si se pasan argumentos, formato estilo %
+            (como en logging.info).
+        *args: Argumentos para el formato del título.
+        nivel: Nivel de logging con el que se registra (por defecto INFO).
+        linea_en_blanco: Si es True, el mensaje empieza con una línea en blanco
+            (en lugar de registrar antes un mensaje vacío).
+        separador: Línea usada arriba y abajo del título (por defecto SEPARADOR).
+    
+    Ejemplo:
+        >>> registrar_banner("Procesando video %d/%d", 3, 10, linea_en_blanco=True)
+    """
+    if logging.getLogger().isEnabledFor(nivel):
+        mensaje = "\n".join((separador, titulo, separador))
+        logging.log(nivel, "\n" + mensaje if linea_en_blanco else mensaje, *args)
+
+
+class _FiltroRetenerHilo(logging.Filter):
+    """Filtro que aparta los registros de ciertos hilos en lugar de dejarlos pasar."""
+    
+    def __init__(self, prefijo_hilo: str):
+        """
+        Inicializa el filtro.
+        
+        Args:
+            prefijo_hilo: Prefijo del nombre de los hilos cuyos registros se retienen.
+        """
+        super().__init__()
+        self.prefijo_hilo = prefijo_hilo
+        self.registros = []
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.threadName.startswith(self.prefijo_hilo):
+            self.registros.append(record)
+            return False
+        return True
+
+
+@contextmanager
+def retener_logs_hilo(prefijo_hilo: str):
+    """
+    Retiene los mensajes de log de los hilos indicados y los escribe juntos al salir.
+    
+    Sirve para que un paso ejecutado en paralelo no mezcle sus mensajes con
+    los del hilo principal: sus registros se escriben en bloque, en orden,
+    cuando termina el bloque with.
+    
+    Args:
+        prefijo_hilo: Prefijo del nombre de los hilos cuyos mensajes se retienen
+            (p. ej. el thread_name_prefix del ThreadPoolExecutor).
+    """
+    filtro = _FiltroRetenerHilo(prefijo_hilo)
+    raiz = logging.getLogger()
+    raiz.addFilter(filtro)
+    try:
+        yield
+    finally:
+        raiz.removeFilter(filtro)
+        for registro in filtro.registros:
+            raiz.handle(registro)
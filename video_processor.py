@@ -7,15 +7,17 @@ Este módulo se encarga de:
 - Manejar errores durante la grabación
 """
 
+import os
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
-from selenium.common.exceptions import TimeoutException
 import config
 from browser_manager import BrowserManager
 from obs_manager import OBSManager
 from file_manager import FileManager
+from utils import registrar_banner
 
 
 class VideoProcessor:
@@ -48,6 +50,20 @@ class VideoProcessor:
         self.browser_manager = browser_manager
         self.obs_manager = obs_manager
         self.file_manager = file_manager
+        
+        # Márgenes y límite de duración (solo en modo prueba); la configuración no cambia entre videos
+        if config.MODO_PRUEBA:
+            self._margen_inicial = config.MARGEN_INICIAL_PRUEBA
+            self._margen_final = config.MARGEN_FINAL_PRUEBA
+            self._duracion_maxima = config.DURACION_MAXIMA_PRUEBA
+        else:
+            self._margen_inicial = config.MARGEN_INICIAL
+            self._margen_final = config.MARGEN_FINAL
+            self._duracion_maxima = None
+        
+        # Última carpeta de módulo y su ruta resuelta (se repite en todos los videos del módulo)
+        self._ruta_modulo_cache: Optional[Path] = None
+        self._ruta_modulo_resuelta: Optional[str] = None
     
     def procesar_video(
         self,
@@ -70,13 +86,12 @@ class VideoProcessor:
             total_videos: Total de videos en el módulo.
         
         Returns:
-            bool: True si se procesó correctamente, False en caso contrario.
+            bool: True si se grabó correctamente, False en caso contrario. El
+            archivo se guarda después en segundo plano; los fallos al guardarlo
+            se informan en el resumen final.
         """
         try:
-            logging.info("")
-            logging.info("=" * 70)
-            logging.info(f"Procesando video {indice_lista}/{total_videos}: {url}")
-            logging.info("=" * 70)
+            registrar_banner("Procesando video %d/%d: %s", indice_lista, total_videos, url, linea_en_blanco=True)
             
             # PASO 0: Configurar directorio de grabación
             if not self._configurar_directorio(ruta_modulo, nombre_modulo):
@@ -92,6 +107,8 @@ class VideoProcessor:
             # PASO 3: Cargar URL en navegador
             if not self._cargar_url(url):
                 self.obs_manager.detener_grabacion()
+                # La pestaña puede haberse quedado bloqueada: no reutilizarla
+                self.browser_manager.descartar_pestaña_videos()
                 return False
             
             # PASO 4: Reproducir video
@@ -102,6 +119,7 @@ class VideoProcessor:
             
             # PASO 6: Obtener información del video
             titulo_video, duracion_segundos = self._obtener_informacion_video()
+            nombre_base = self.file_manager.generar_nombre_base(titulo_video, numero_video)
             
             # PASO 7: Monitorear reproducción
             self._monitorear_reproduccion(duracion_segundos)
@@ -111,53 +129,35 @@ class VideoProcessor:
             
             # PASO 9: Detener grabación y gestionar archivo
             if not self._finalizar_grabacion(
-                ruta_modulo, titulo_video, numero_video, duracion_segundos, indice_lista, total_videos
+                ruta_modulo, nombre_base, duracion_segundos, indice_lista, total_videos
             ):
                 return False
             
             # Limpieza antes del siguiente video
             self._limpiar_antes_siguiente_video()
             
-            logging.info("=" * 70)
-            logging.info(f"✓ Video {indice_lista}/{total_videos} completado")
-            logging.info("=" * 70)
+            registrar_banner("✓ Video %d/%d grabado (el archivo se guarda en segundo plano)", indice_lista, total_videos)
             logging.info("")
             
             return True
         
-        except TimeoutException as e:
-            logging.error(f"Tiempo de espera agotado al cargar el video {url}")
-            logging.error(f"Puede ser un video privado, eliminado o la conexión es lenta.")
-            logging.error(f"Error: {e}")
-            self.obs_manager.asegurar_grabacion_detenida()
-            return False
-        
         except Exception as e:
-            logging.error(f"Ocurrió un error inesperado al procesar {url}: {e}")
-            logging.error(f"Tipo de error: {type(e).__name__}")
-            import traceback
-            logging.error(f"Traceback completo:\n{traceback.format_exc()}")
+            logging.exception("Ocurrió un error inesperado al procesar %s (%s): %s", url, type(e).__name__, e)
             self.obs_manager.asegurar_grabacion_detenida()
             return False
     
     def _configurar_directorio(self, ruta_modulo: Path, nombre_modulo: str) -> bool:
         """Configura el directorio de grabación en OBS."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 0: CONFIGURANDO DIRECTORIO DE GRABACIÓN")
-        logging.info("=" * 70)
+        registrar_banner("PASO 0: CONFIGURANDO DIRECTORIO DE GRABACIÓN", linea_en_blanco=True)
         
         if not self.obs_manager.configurar_directorio_grabacion(ruta_modulo):
-            logging.error(f"ERROR CRÍTICO: No se pudo configurar directorio en OBS para '{nombre_modulo}'")
+            logging.error("ERROR CRÍTICO: No se pudo configurar directorio en OBS para '%s'", nombre_modulo)
             return False
         return True
     
     def _iniciar_grabacion(self) -> bool:
         """Inicia la grabación en OBS."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 1: INICIANDO GRABACIÓN EN OBS")
-        logging.info("=" * 70)
+        registrar_banner("PASO 1: INICIANDO GRABACIÓN EN OBS", linea_en_blanco=True)
         
         if not self.obs_manager.iniciar_grabacion():
             logging.error("ERROR: No se pudo iniciar la grabación. Saltando video...")
@@ -165,55 +165,51 @@ class VideoProcessor:
         return True
     
     def _esperar_margen_inicial(self) -> None:
-        """Espera el margen inicial mientras ya está grabando."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 2: ESPERANDO MARGEN INICIAL (grabación activa)")
-        logging.info("=" * 70)
+        """
+        Espera el margen inicial mientras ya está grabando.
+        
+        La comprobación del navegador se hace dentro del margen, de modo que
+        su coste queda cubierto por la espera en lugar de sumarse a la carga.
+        """
+        registrar_banner("PASO 2: ESPERANDO MARGEN INICIAL (grabación activa)", linea_en_blanco=True)
+        
+        margen_inicial = self._margen_inicial
+        limite = time.monotonic() + margen_inicial
+        
+        self.browser_manager.verificar_conexion()
         
-        margen_inicial = config.MARGEN_INICIAL_PRUEBA if config.MODO_PRUEBA else config.MARGEN_INICIAL
         if margen_inicial > 0:
-            logging.info(f"Esperando {margen_inicial} segundos de margen inicial (ya está grabando)...")
-            time.sleep(margen_inicial)
+            logging.info("Esperando %s segundos de margen inicial (ya está grabando)...", margen_inicial)
+            restante = limite - time.monotonic()
+            if restante > 0:
+                time.sleep(restante)
     
     def _cargar_url(self, url: str) -> bool:
         """Carga la URL en el navegador."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 3: CARGANDO VIDEO EN NAVEGADOR")
-        logging.info("=" * 70)
+        registrar_banner("PASO 3: CARGANDO VIDEO EN NAVEGADOR", linea_en_blanco=True)
         
         if not self.browser_manager.cargar_url(url):
-            logging.error(f"ERROR: No se pudo cargar la URL. Deteniendo grabación y saltando video...")
+            logging.error("ERROR: No se pudo cargar la URL. Deteniendo grabación y saltando video...")
             return False
         return True
     
     def _reproducir_video(self) -> None:
         """Reproduce el video."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 4: REPRODUCIENDO VIDEO")
-        logging.info("=" * 70)
+        registrar_banner("PASO 4: REPRODUCIENDO VIDEO", linea_en_blanco=True)
         
         if not self.browser_manager.reproducir_video():
             logging.warning("No se pudo reproducir el video. Continuando de todas formas...")
     
     def _configurar_pantalla_completa(self) -> None:
         """Configura pantalla completa."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 5: CONFIGURANDO PANTALLA COMPLETA")
-        logging.info("=" * 70)
+        registrar_banner("PASO 5: CONFIGURANDO PANTALLA COMPLETA", linea_en_blanco=True)
         
         if not self.browser_manager.configurar_pantalla_completa():
             logging.warning("No se pudo configurar pantalla completa. Continuando de todas formas...")
     
     def _obtener_informacion_video(self) -> tuple:
         """Obtiene información del video (título y duración)."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 6: OBTENIENDO INFORMACIÓN DEL VIDEO (grabación activa)")
-        logging.info("=" * 70)
+        registrar_banner("PASO 6: OBTENIENDO INFORMACIÓN DEL VIDEO (grabación activa)", linea_en_blanco=True)
         
         # Obtener título
         titulo_video = self.browser_manager.obtener_titulo_video()
@@ -230,92 +226,117 @@ class VideoProcessor:
             duracion_segundos = 60
         
         # Aplicar limitación de duración en modo prueba
-        duracion_original = duracion_segundos
-        if config.MODO_PRUEBA and config.DURACION_MAXIMA_PRUEBA:
-            duracion_segundos = min(duracion_segundos, config.DURACION_MAXIMA_PRUEBA)
-            if duracion_original > config.DURACION_MAXIMA_PRUEBA:
-                logging.info(f"Modo prueba: Limitando grabación a {config.DURACION_MAXIMA_PRUEBA}s (duración real: {duracion_original}s)")
+        duracion_maxima = self._duracion_maxima
+        if duracion_maxima and duracion_segundos > duracion_maxima:
+            logging.info("Modo prueba: Limitando grabación a %ss (duración real: %ss)", duracion_maxima, duracion_segundos)
+            duracion_segundos = duracion_maxima
         
         return titulo_video, duracion_segundos
     
     def _monitorear_reproduccion(self, duracion_segundos: int) -> None:
         """Monitorea la reproducción durante la duración restante."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 7: MONITOREANDO REPRODUCCIÓN")
-        logging.info("=" * 70)
-        logging.info(f"Grabando video durante {duracion_segundos} segundos (duración del contenido)...")
+        registrar_banner("PASO 7: MONITOREANDO REPRODUCCIÓN", linea_en_blanco=True)
+        logging.info("Grabando video durante %s segundos (duración del contenido)...", duracion_segundos)
         self.browser_manager.monitorear_reproduccion(duracion_segundos)
     
     def _esperar_margen_final(self) -> None:
         """Espera el margen final antes de detener la grabación."""
-        margen_final = config.MARGEN_FINAL_PRUEBA if config.MODO_PRUEBA else config.MARGEN_FINAL
+        margen_final = self._margen_final
         if margen_final > 0:
-            logging.info("")
-            logging.info("=" * 70)
-            logging.info("PASO 8: ESPERANDO MARGEN FINAL")
-            logging.info("=" * 70)
-            logging.info(f"Esperando {margen_final} segundos de margen final antes de detener la grabación...")
+            registrar_banner("PASO 8: ESPERANDO MARGEN FINAL", linea_en_blanco=True)
+            logging.info("Esperando %s segundos de margen final antes de detener la grabación...", margen_final)
             time.sleep(margen_final)
     
     def _finalizar_grabacion(
         self,
         ruta_modulo: Path,
-        titulo_video: str,
-        numero_video: int,
+        nombre_base: str,
         duracion_segundos: int,
         indice_lista: int,
         total_videos: int
     ) -> bool:
-        """Detiene la grabación y gestiona el archivo."""
-        logging.info("")
-        logging.info("=" * 70)
-        logging.info("PASO 9: DETENIENDO GRABACIÓN")
-        logging.info("=" * 70)
+        """
+        Detiene la grabación y envía el archivo a gestionar en segundo plano.
+        
+        El guardado del archivo continúa mientras se prepara el siguiente video;
+        el orquestador espera a los pendientes antes del resumen final.
+        """
+        registrar_banner("PASO 9: DETENIENDO GRABACIÓN", linea_en_blanco=True)
         
         # Detener grabación y obtener ruta
         ruta_original = self.obs_manager.detener_grabacion()
         
         # Si la ruta no está en el directorio correcto, buscar el archivo más reciente
         if ruta_original:
-            ruta_original_normalizada = Path(ruta_original).resolve()
-            directorio_actual_normalizado = Path(ruta_modulo).resolve()
+            directorio_original_normalizado = os.path.normcase(os.path.dirname(os.path.realpath(ruta_original)))
+            directorio_actual_normalizado = self._resolver_ruta_modulo(ruta_modulo)
             
-            if ruta_original_normalizada.parent != directorio_actual_normalizado:
-                logging.warning(f"ADVERTENCIA: La ruta obtenida ({ruta_original}) no está en el directorio del módulo actual ({ruta_modulo})")
+            if directorio_original_normalizado != directorio_actual_normalizado:
+                logging.warning("ADVERTENCIA: La ruta obtenida (%s) no está en el directorio del módulo actual (%s)", ruta_original, ruta_modulo)
                 logging.info("Buscando el archivo más reciente en el directorio del módulo actual...")
                 
                 archivo_reciente = self.file_manager.buscar_archivo_reciente(ruta_modulo)
                 if archivo_reciente:
                     ruta_original = archivo_reciente
-                    logging.info(f"✓ Archivo encontrado en el directorio correcto: {ruta_original}")
+                    logging.info("✓ Archivo encontrado en el directorio correcto: %s", ruta_original)
         
-        # Gestionar archivo grabado
+        # Gestionar archivo grabado (en segundo plano)
         if ruta_original:
-            return self.file_manager.gestionar_archivo_grabado(
+            self.file_manager.gestionar_archivo_en_segundo_plano(
                 ruta_original,
                 ruta_modulo,
-                titulo_video,
-                numero_video,
-                duracion_segundos
+                nombre_base,
+                duracion_segundos,
+                f"video {indice_lista}/{total_videos} ({nombre_base})"
             )
+            return True
         else:
             logging.warning("No se pudo obtener la ruta del archivo grabado")
             return False
     
-    def _limpiar_antes_siguiente_video(self) -> None:
-        """Limpia recursos antes del siguiente video."""
-        # Pausa entre videos
-        logging.info("Esperando antes del siguiente video...")
-        time.sleep(2)
+    def _resolver_ruta_modulo(self, ruta_modulo: Path) -> str:
+        """
+        Devuelve la ruta resuelta de la carpeta del módulo.
         
-        # Asegurar que no hay grabación activa
-        self.obs_manager.asegurar_grabacion_detenida()
+        Solo se resuelve cuando cambia el módulo; el resto de videos del mismo
+        módulo reutilizan el resultado sin repetir las llamadas al sistema.
         
-        # Salir de pantalla completa
-        self.browser_manager.salir_pantalla_completa()
+        Args:
+            ruta_modulo: Carpeta del módulo actual.
         
-        # Cerrar pestaña actual
-        logging.info("Cerrando pestaña actual para preparar el siguiente video...")
-        self.browser_manager.cerrar_pestaña_actual()
+        Returns:
+            str: Ruta absoluta y normalizada de la carpeta (sin distinguir
+            mayúsculas en Windows).
+        """
+        if ruta_modulo != self._ruta_modulo_cache:
+            self._ruta_modulo_resuelta = os.path.normcase(os.path.realpath(ruta_modulo))
+            self._ruta_modulo_cache = ruta_modulo
+        return self._ruta_modulo_resuelta
+    
+    def _limpiar_antes_siguiente_video(self) -> None:
+        """
+        Limpia recursos antes del siguiente video.
+        
+        La espera y la comprobación de OBS se ejecutan en un hilo secundario
+        mientras se limpia el navegador en el hilo principal, ya que usan
+        conexiones independientes.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            futuro_obs = executor.submit(self._esperar_obs_inactivo)
+            
+            # Salir de pantalla completa
+            self.browser_manager.salir_pantalla_completa()
+            
+            # Pausar el video; la pestaña se reutiliza para el siguiente
+            self.browser_manager.pausar_videos()
+            
+            futuro_obs.result()
+    
+    def _esperar_obs_inactivo(self) -> None:
+        """
+        Espera (hasta 2 segundos) a que OBS quede inactivo y asegura que no hay
+        grabación activa. Con OBS ya detenido, vuelve de inmediato.
+        """
+        logging.info("Esperando a que OBS quede inactivo antes del siguiente video...")
+        self.obs_manager.asegurar_grabacion_detenida(espera_inactiva=2.0)
 